@@ -8,14 +8,19 @@ Features:
 - Initialize treasury with list of signers and approval threshold
 - Create spending proposals with recipient and amount
 - On-chain approval tracking
+- BLS aggregated approvals: M signatures verified in one pairing check
+- Batched ed25519 approvals: M votes counted with a single box write
+- One-bit-per-signer vote bitmaps, so each signer is counted once
 - Automatic fund release when threshold is met
 - Full transparency - all proposals and votes visible on-chain
 
 Algorand Primitives Used:
 - AVM Application (smart contract)
 - Inner Transactions (for fund release)
-- Boxes (for storing proposals and signers)
+- Boxes (for storing proposals, signers and BLS keys)
 - Multi-sig logic via application state
+- BLS12-381 elliptic curve opcodes (ec_add, ec_map_to, ec_pairing_check)
+- ed25519verify_bare for off-chain signed votes
 """
 
 from algopy import (
@@ -24,14 +29,18 @@ from algopy import (
     Bytes,
     Global,
     GlobalState,
-    LocalState,
     Txn,
     UInt64,
     arc4,
     itxn,
     op,
     Box,
+    BoxMap,
     BoxRef,
+    OpUpFeeSource,
+    ensure_budget,
+    subroutine,
+    urange,
 )
 from algopy.arc4 import abimethod, Address, String, UInt64 as ARC4UInt64, Bool
 
@@ -39,12 +48,38 @@ from algopy.arc4 import abimethod, Address, String, UInt64 as ARC4UInt64, Bool
 # Maximum signers in the DAO
 MAX_SIGNERS = 10
 
-# Proposal status constants
+# Signer addresses are packed into one box, ADDRESS_LENGTH bytes per slot
+ADDRESS_LENGTH = 32
+
+# Proposal ids are stored in box keys as their low PROPOSAL_ID_BYTES bytes
+# (3 bytes = 16.7M proposals), saving 5 bytes of min-balance per box
+PROPOSAL_ID_BYTES = 3
+
+# Proposal status constants (stored as a single byte)
 STATUS_PENDING = UInt64(0)
 STATUS_APPROVED = UInt64(1)
 STATUS_EXECUTED = UInt64(2)
 STATUS_REJECTED = UInt64(3)
 
+# BLS12-381 encodings used by the AVM elliptic curve opcodes (uncompressed)
+BLS_PUBKEY_LENGTH = 96      # G1 point
+BLS_SIGNATURE_LENGTH = 192  # G2 point
+
+# Opcode budget for one BLS verification (ec_map_to G2 + 2-pair pairing check
+# + up to MAX_SIGNERS ec_add), covered by inner OpUp calls
+BLS_VERIFY_BUDGET = 60_000
+
+# Opcode cost of one ed25519verify_bare
+ED25519_VERIFY_COST = 1_900
+ED25519_SIGNATURE_LENGTH = 64
+
+# Negated BLS12-381 G1 generator, so e(pk, H(m)) == e(g1, sig) can be
+# checked as e(pk, H(m)) * e(-g1, sig) == 1 in a single pairing check
+BLS_G1_NEG_GENERATOR = Bytes.from_hex(
+    "17F1D3A73197D7942695638C4FA9AC0FC3688C4F9774B905A14E3A3F171BAC586C55E83FF97A1AEFFB3AF00ADB22C6BB"
+    "114D1D6855D545A8AA7D76C8CF2E21F267816AEF1DB507C96655B9D5CAAC42364E6F38BA0ECB751BAD54DCD6B939C2CA"
+)
+
 
 class DAOTreasury(ARC4Contract):
     """
@@ -58,23 +93,32 @@ class DAOTreasury(ARC4Contract):
         - proposal_count: Total proposals created
         - treasury_balance: Current treasury balance
         
-    - Local State (per signer):
-        - is_signer: Whether account is a signer
-        
     - Boxes:
-        - signers: List of signer addresses
-        - proposal_{id}: Proposal details
-        - votes_{id}: Vote tracking per proposal
+        - signers: Signer addresses packed by slot (32 bytes each, zero if free)
+        - since: Per slot, the proposal count when its signer joined (8 bytes
+          each, all ones if free); older proposals don't take its votes
+        - idx_{address}: Signer slot index (present only for signers)
+        - bls_{index}: Signer BLS12-381 public key (G1, 96 bytes)
+        - meta_{id}: Proposal creator, recipient and amount (immutable)
+        - status_{id}: Proposal status (1 byte)
+        - bits_{id}: Proposal votes, bit i set if the signer in slot i approved
     """
     
-    # Global State
-    creator: GlobalState[Account]
-    threshold: GlobalState[UInt64]
-    signer_count: GlobalState[UInt64]
-    proposal_count: GlobalState[UInt64]
-    
-    # Local State
-    is_signer: LocalState[UInt64]
+    def __init__(self) -> None:
+        # Global State
+        self.creator = GlobalState(Account)
+        self.threshold = GlobalState(UInt64)
+        self.signer_count = GlobalState(UInt64)
+        self.proposal_count = GlobalState(UInt64)
+        
+        # Boxes (prefix + itob(key), proposal boxes prefix + _proposal_key(id))
+        self.signers = BoxRef(key=b"signers")
+        self.signer_since = BoxRef(key=b"since")
+        self.signer_slot = BoxMap(Account, UInt64, key_prefix=b"idx_")
+        self.bls_keys = BoxMap(UInt64, Bytes, key_prefix=b"bls_")
+        self.proposal_meta = BoxMap(Bytes, Bytes, key_prefix=b"meta_")
+        self.proposal_status = BoxMap(Bytes, Bytes, key_prefix=b"status_")
+        self.proposal_votes = BoxMap(Bytes, UInt64, key_prefix=b"bits_")
     
     @arc4.abimethod(create="require")
     def create(self, threshold: arc4.UInt64) -> None:
@@ -91,14 +135,6 @@ class DAOTreasury(ARC4Contract):
         self.signer_count.value = UInt64(0)
         self.proposal_count.value = UInt64(0)
     
-    @arc4.abimethod(allow_actions=["OptIn"])
-    def opt_in(self) -> None:
-        """
-        Opt into the treasury as a potential signer.
-        Only the creator can add signers after opt-in.
-        """
-        self.is_signer[Txn.sender] = UInt64(0)  # Not a signer yet
-    
     @arc4.abimethod
     def add_signer(self, signer: arc4.Address) -> None:
         """
@@ -112,14 +148,26 @@ class DAOTreasury(ARC4Contract):
         assert self.signer_count.value < UInt64(MAX_SIGNERS), "Max signers reached"
         
         signer_account = Account(signer.bytes)
-        
-        # Mark as signer
-        self.is_signer[signer_account] = UInt64(1)
-        
-        # Store in signers box
-        signer_index = self.signer_count.value
-        signer_key = Bytes(b"signer_") + op.itob(signer_index)
-        op.Box.put(signer_key, signer.bytes)
+        assert signer_account != Global.zero_address, "Invalid signer"
+        assert signer_account not in self.signer_slot, "Already a signer"
+        
+        # Created on first use rather than in create, when the app
+        # account can't be funded for the box yet
+        self.signers.create(size=UInt64(MAX_SIGNERS * ADDRESS_LENGTH))
+        self.signer_since.create(size=UInt64(MAX_SIGNERS * 8))
+        
+        # Store in the first free slot; slots are zeroed on removal,
+        # so one exists while signer_count < MAX_SIGNERS
+        packed = self.signers.extract(0, MAX_SIGNERS * ADDRESS_LENGTH)
+        signer_index = UInt64(0)
+        while op.extract(packed, signer_index * ADDRESS_LENGTH, ADDRESS_LENGTH) != Global.zero_address.bytes:
+            signer_index += UInt64(1)
+        self.signers.replace(signer_index * ADDRESS_LENGTH, signer.bytes)
+        self.signer_slot[signer_account] = signer_index
+        
+        # The slot may carry a previous signer's votes on existing proposals;
+        # those are ignored, and this signer can only vote on newer ones
+        self.signer_since.replace(signer_index * 8, op.itob(self.proposal_count.value))
         
         # Increment signer count
         self.signer_count.value = self.signer_count.value + UInt64(1)
@@ -138,13 +186,14 @@ class DAOTreasury(ARC4Contract):
         """
         assert Txn.sender == self.creator.value, "Only creator can remove signers"
         
-        signer_account = Account(signer.bytes)
-        assert self.is_signer[signer_account] == UInt64(1), "Not a signer"
+        assert Account(signer.bytes) in self.signer_slot, "Not a signer"
         
-        # Mark as non-signer
-        self.is_signer[signer_account] = UInt64(0)
         self.signer_count.value = self.signer_count.value - UInt64(1)
         
+        # Free the signer's slot and BLS key; their votes on pending
+        # proposals stop counting (see _current_votes)
+        self._release_signer_slot(signer.bytes)
+        
         # Ensure we still have enough signers for threshold
         assert self.signer_count.value >= self.threshold.value, "Cannot go below threshold"
     
@@ -172,6 +221,9 @@ class DAOTreasury(ARC4Contract):
         Create a new spending proposal.
         Only signers can create proposals.
         
+        The proposal starts with the creator's approval. With a threshold
+        of 1 it is executed in the same call if the treasury can cover it.
+        
         Args:
             recipient: Address to receive the funds
             amount: Amount in microALGOs
@@ -180,34 +232,30 @@ class DAOTreasury(ARC4Contract):
         Returns:
             The proposal ID
         """
-        assert self.is_signer[Txn.sender] == UInt64(1), "Only signers can propose"
+        assert Txn.sender in self.signer_slot, "Only signers can propose"
         assert amount.native > UInt64(0), "Amount must be positive"
         
-        # Check treasury has sufficient funds
-        app_balance = Global.current_application_address.balance
-        min_balance = Global.current_application_address.min_balance
-        available = app_balance - min_balance
-        assert amount.native <= available, "Insufficient treasury balance"
+        # Treasury balance is not required here: funds can arrive after the
+        # proposal, and the inner payment in execute fails if they don't
         
         # Create proposal
         proposal_id = self.proposal_count.value
         self.proposal_count.value = proposal_id + UInt64(1)
-        
-        # Store proposal in box
-        # Format: creator (32) + recipient (32) + amount (8) + status (8) + approvals (8)
-        proposal_key = Bytes(b"prop_") + op.itob(proposal_id)
-        proposal_data = (
-            Txn.sender.bytes +      # Creator
-            recipient.bytes +        # Recipient
-            op.itob(amount.native) + # Amount
-            op.itob(STATUS_PENDING) + # Status
-            op.itob(UInt64(0))       # Approval count
-        )
-        op.Box.put(proposal_key, proposal_data)
-        
-        # Initialize votes box for this proposal
-        votes_key = Bytes(b"votes_") + op.itob(proposal_id)
-        op.Box.put(votes_key, Bytes(b""))
+        key = self._proposal_key(proposal_id)
+        
+        # Store proposal across three boxes so single-field updates
+        # only rewrite a few bytes:
+        # - meta_{id}: creator (32) + recipient (32) + amount (8), immutable
+        # - status_{id}: status (1)
+        # - bits_{id}: vote bitmap (8)
+        meta_data = Txn.sender.bytes + recipient.bytes + op.itob(amount.native)
+        self.proposal_meta[key] = meta_data
+        self.proposal_status[key] = Bytes(b"\x00")  # STATUS_PENDING
+        self.proposal_votes[key] = UInt64(1) << self.signer_slot[Txn.sender]
+        
+        # The creator's approval alone meets a threshold of 1
+        if self.threshold.value == UInt64(1) and self._available() >= amount.native:
+            self._pay_out(key, meta_data)
         
         return arc4.UInt64(proposal_id)
     
@@ -220,37 +268,72 @@ class DAOTreasury(ARC4Contract):
         Args:
             proposal_id: ID of the proposal to approve
         """
-        assert self.is_signer[Txn.sender] == UInt64(1), "Only signers can approve"
+        assert Txn.sender in self.signer_slot, "Only signers can approve"
+        
+        key = self._proposal_key(proposal_id.native)
+        self._assert_pending(key)
+        
+        # Set the caller's vote bit
+        slot = self.signer_slot[Txn.sender]
+        self._assert_joined_before(slot, proposal_id.native)
+        mask = UInt64(1) << slot
+        votes = self._current_votes(proposal_id.native, self.proposal_votes[key])
+        assert (votes & mask) == UInt64(0), "Already approved"
+        self._set_votes(key, votes | mask)
+    
+    @arc4.abimethod
+    def approve_many(
+        self,
+        proposal_id: arc4.UInt64,
+        signer_slots: arc4.DynamicArray[arc4.UInt64],
+        signatures: arc4.DynamicArray[arc4.DynamicBytes],
+    ) -> None:
+        """
+        Record several signer approvals in one call.
         
-        # Get proposal
-        proposal_key = Bytes(b"prop_") + op.itob(proposal_id.native)
-        proposal_exists, proposal_data = op.Box.get(proposal_key)
-        assert proposal_exists, "Proposal does not exist"
+        Each signer signs sha512_256(app_id || proposal_id || creator || recipient || amount)
+        with their account key off-chain. Signatures are checked against the
+        address stored in the signer's slot, and the vote bitmap is
+        written once at the end. Can be submitted by anyone, the signatures
+        are the authorization.
         
-        # Check proposal is pending
-        status = op.btoi(op.extract(proposal_data, 80, 8))
-        assert status == STATUS_PENDING, "Proposal not pending"
+        Args:
+            proposal_id: ID of the proposal to approve
+            signer_slots: Signer slot of each signature
+            signatures: ed25519 signatures (64 bytes each)
+        """
+        assert signer_slots.length == signatures.length, "Slot and signature count mismatch"
         
-        # Check signer hasn't already voted
-        votes_key = Bytes(b"votes_") + op.itob(proposal_id.native)
-        votes_exists, votes_data = op.Box.get(votes_key)
-        assert votes_exists, "Votes box missing"
+        key = self._proposal_key(proposal_id.native)
+        self._assert_pending(key)
         
-        # Add signer's vote (append their address)
-        # In production, would check for duplicates
-        new_votes = votes_data + Txn.sender.bytes
-        op.Box.put(votes_key, new_votes)
+        message = self._proposal_digest(proposal_id.native, self.proposal_meta[key])
+        ensure_budget(UInt64(ED25519_VERIFY_COST) * signatures.length, OpUpFeeSource.GroupCredit)
         
-        # Increment approval count
-        current_approvals = op.btoi(op.extract(proposal_data, 88, 8))
-        new_approvals = current_approvals + UInt64(1)
+        votes = self._current_votes(proposal_id.native, self.proposal_votes[key])
+        approvals = self._popcount(votes)
+        packed = self.signers.extract(0, MAX_SIGNERS * ADDRESS_LENGTH)
+        for i in urange(signatures.length):
+            # Votes past the threshold don't change the outcome
+            if approvals >= self.threshold.value:
+                break
+            
+            slot = signer_slots[i].native
+            assert slot < UInt64(MAX_SIGNERS), "Invalid signer slot"
+            mask = UInt64(1) << slot
+            assert (votes & mask) == UInt64(0), "Already approved"
+            votes |= mask
+            
+            signer_data = op.extract(packed, slot * ADDRESS_LENGTH, ADDRESS_LENGTH)
+            assert signer_data != Global.zero_address.bytes, "Signer slot does not exist"
+            self._assert_joined_before(slot, proposal_id.native)
+            
+            signature = signatures[i].native
+            assert signature.length == UInt64(ED25519_SIGNATURE_LENGTH), "Invalid signature length"
+            assert op.ed25519verify_bare(message, signature, signer_data), "Invalid signature"
+            approvals += UInt64(1)
         
-        # Update proposal with new approval count
-        updated_proposal = (
-            op.extract(proposal_data, 0, 88) +  # Keep first 88 bytes
-            op.itob(new_approvals)               # Update approval count
-        )
-        op.Box.put(proposal_key, updated_proposal)
+        self._set_votes(key, votes)
     
     @arc4.abimethod
     def execute(self, proposal_id: arc4.UInt64) -> None:
@@ -261,39 +344,144 @@ class DAOTreasury(ARC4Contract):
         Args:
             proposal_id: ID of the proposal to execute
         """
-        assert self.is_signer[Txn.sender] == UInt64(1), "Only signers can execute"
-        
-        # Get proposal
-        proposal_key = Bytes(b"prop_") + op.itob(proposal_id.native)
-        proposal_exists, proposal_data = op.Box.get(proposal_key)
-        assert proposal_exists, "Proposal does not exist"
+        assert Txn.sender in self.signer_slot, "Only signers can execute"
         
-        # Check status is pending
-        status = op.btoi(op.extract(proposal_data, 80, 8))
-        assert status == STATUS_PENDING, "Proposal not pending"
+        key = self._proposal_key(proposal_id.native)
+        self._assert_pending(key)
         
         # Check threshold is met
-        approvals = op.btoi(op.extract(proposal_data, 88, 8))
+        approvals = self._popcount(self._current_votes(proposal_id.native, self.proposal_votes[key]))
         assert approvals >= self.threshold.value, "Threshold not met"
         
-        # Extract recipient and amount
-        recipient_bytes = op.extract(proposal_data, 32, 32)
-        amount = op.btoi(op.extract(proposal_data, 64, 8))
+        self._pay_out(key, self.proposal_meta[key])
+    
+    @arc4.abimethod
+    def execute_nofn(
+        self,
+        proposal_id: arc4.UInt64,
+        signatures: arc4.DynamicArray[arc4.DynamicBytes],
+    ) -> None:
+        """
+        Execute a proposal signed off-chain by every current signer.
         
-        # Execute payment via inner transaction
-        itxn.Payment(
-            receiver=Account(recipient_bytes),
-            amount=amount,
-            fee=Global.min_txn_fee,
-        ).submit()
+        When the whole council signs, the threshold is met whatever it is,
+        so no approve calls or vote bookkeeping are needed beforehand.
+        Signatures are over the same message as approve_many, ordered by
+        signer slot. Can be submitted by anyone.
         
-        # Update proposal status to executed
-        updated_proposal = (
-            op.extract(proposal_data, 0, 80) +  # Keep first 80 bytes
-            op.itob(STATUS_EXECUTED) +           # Update status
-            op.extract(proposal_data, 88, 8)     # Keep approval count
-        )
-        op.Box.put(proposal_key, updated_proposal)
+        Args:
+            proposal_id: ID of the proposal to execute
+            signatures: ed25519 signatures of all signers, in slot order
+        """
+        # Resignations can leave fewer signers than the threshold, and then
+        # the whole council no longer meets it
+        assert self.signer_count.value >= self.threshold.value, "Threshold not met"
+        assert signatures.length == self.signer_count.value, "Need one signature per signer"
+        
+        key = self._proposal_key(proposal_id.native)
+        self._assert_pending(key)
+        
+        meta_data = self.proposal_meta[key]
+        message = self._proposal_digest(proposal_id.native, meta_data)
+        ensure_budget(UInt64(ED25519_VERIFY_COST) * signatures.length, OpUpFeeSource.GroupCredit)
+        
+        votes = UInt64(0)
+        next_signature = UInt64(0)
+        packed = self.signers.extract(0, MAX_SIGNERS * ADDRESS_LENGTH)
+        for i in urange(MAX_SIGNERS):
+            signer_data = op.extract(packed, i * ADDRESS_LENGTH, ADDRESS_LENGTH)
+            if signer_data != Global.zero_address.bytes:
+                signature = signatures[next_signature].native
+                assert signature.length == UInt64(ED25519_SIGNATURE_LENGTH), "Invalid signature length"
+                assert op.ed25519verify_bare(message, signature, signer_data), "Invalid signature"
+                votes |= UInt64(1) << i
+                next_signature += UInt64(1)
+        
+        self._pay_out(key, meta_data)
+        # Record who signed
+        self._set_votes(key, votes)
+    
+    @arc4.abimethod
+    def register_bls_key(
+        self,
+        signer_index: arc4.UInt64,
+        pubkey: arc4.DynamicBytes,
+        proof_of_possession: arc4.DynamicBytes,
+    ) -> None:
+        """
+        Register the caller's BLS12-381 public key for aggregated approvals.
+        
+        The proof of possession is a BLS signature over the public key itself,
+        which prevents a signer from registering a rogue key derived from
+        other signers' keys.
+        
+        Args:
+            signer_index: Slot assigned to the caller by add_signer
+            pubkey: Uncompressed G1 public key (96 bytes)
+            proof_of_possession: Uncompressed G2 signature over the pubkey (192 bytes)
+        """
+        assert Txn.sender in self.signer_slot, "Only signers can register keys"
+        
+        assert self.signer_slot[Txn.sender] == signer_index.native, "Signer slot belongs to another account"
+        
+        pk = pubkey.native
+        assert pk.length == UInt64(BLS_PUBKEY_LENGTH), "Invalid BLS public key length"
+        assert op.EllipticCurve.subgroup_check(op.EC.BLS12_381g1, pk), "Invalid BLS public key"
+        assert self._bls_verify(pk, op.sha512_256(pk), proof_of_possession.native), "Invalid proof of possession"
+        
+        self.bls_keys[signer_index.native] = pk
+    
+    @arc4.abimethod
+    def execute_aggregated(
+        self,
+        proposal_id: arc4.UInt64,
+        agg_sig: arc4.DynamicBytes,
+        signer_bitmap: arc4.UInt64,
+    ) -> None:
+        """
+        Execute a proposal approved off-chain with an aggregated BLS signature.
+        
+        Signers sign sha512_256(app_id || proposal_id || creator || recipient || amount)
+        and the partial signatures are summed client-side. No per-signer vote
+        state is written; one pairing check replaces the approve round trips.
+        Can be submitted by anyone, the signature is the authorization.
+        
+        Args:
+            proposal_id: ID of the proposal to execute
+            agg_sig: Aggregated G2 signature (192 bytes)
+            signer_bitmap: Bit i set if the signer in slot i contributed
+        """
+        assert agg_sig.native.length == UInt64(BLS_SIGNATURE_LENGTH), "Invalid BLS signature length"
+        assert (signer_bitmap.native >> UInt64(MAX_SIGNERS)) == UInt64(0), "Invalid signer bitmap"
+        
+        key = self._proposal_key(proposal_id.native)
+        self._assert_pending(key)
+        
+        # Aggregate the public keys of the contributing signers
+        agg_pk = Bytes(b"")
+        signers = UInt64(0)
+        for i in urange(MAX_SIGNERS):
+            if signer_bitmap.native & (UInt64(1) << i):
+                # Same rule as approve: a slot's signer can't co-sign proposals
+                # created before they joined
+                self._assert_joined_before(i, proposal_id.native)
+                pk, has_key = self.bls_keys.maybe(i)
+                assert has_key, "Signer has no BLS key"
+                if signers == UInt64(0):
+                    agg_pk = pk
+                else:
+                    agg_pk = op.EllipticCurve.add(op.EC.BLS12_381g1, agg_pk, pk)
+                signers += UInt64(1)
+        
+        assert signers >= self.threshold.value, "Threshold not met"
+        
+        meta_data = self.proposal_meta[key]
+        message = self._proposal_digest(proposal_id.native, meta_data)
+        assert self._bls_verify(agg_pk, message, agg_sig.native), "Invalid aggregated signature"
+        
+        self._pay_out(key, meta_data)
+        # Record who signed
+        self._set_votes(key, signer_bitmap.native)
     
     @arc4.abimethod
     def reject(self, proposal_id: arc4.UInt64) -> None:
@@ -303,26 +491,15 @@ class DAOTreasury(ARC4Contract):
         Args:
             proposal_id: ID of the proposal to reject
         """
-        # Get proposal
-        proposal_key = Bytes(b"prop_") + op.itob(proposal_id.native)
-        proposal_exists, proposal_data = op.Box.get(proposal_key)
-        assert proposal_exists, "Proposal does not exist"
+        key = self._proposal_key(proposal_id.native)
+        self._assert_pending(key)
         
         # Check caller is proposal creator
-        proposal_creator = op.extract(proposal_data, 0, 32)
+        proposal_creator = op.extract(self.proposal_meta[key], 0, 32)
         assert Txn.sender.bytes == proposal_creator, "Only creator can reject"
         
-        # Check status is pending
-        status = op.btoi(op.extract(proposal_data, 80, 8))
-        assert status == STATUS_PENDING, "Proposal not pending"
-        
         # Update status to rejected
-        updated_proposal = (
-            op.extract(proposal_data, 0, 80) +   # Keep first 80 bytes
-            op.itob(STATUS_REJECTED) +            # Update status
-            op.extract(proposal_data, 88, 8)      # Keep approval count
-        )
-        op.Box.put(proposal_key, updated_proposal)
+        self._set_status(key, STATUS_REJECTED)
     
     @arc4.abimethod
     def get_proposal(
@@ -337,18 +514,38 @@ class DAOTreasury(ARC4Contract):
         Returns:
             Tuple of (creator, recipient, amount, status, approvals)
         """
-        proposal_key = Bytes(b"prop_") + op.itob(proposal_id.native)
-        proposal_exists, proposal_data = op.Box.get(proposal_key)
+        key = self._proposal_key(proposal_id.native)
+        meta_data, proposal_exists = self.proposal_meta.maybe(key)
         assert proposal_exists, "Proposal does not exist"
         
-        creator = arc4.Address(op.extract(proposal_data, 0, 32))
-        recipient = arc4.Address(op.extract(proposal_data, 32, 32))
-        amount = arc4.UInt64(op.btoi(op.extract(proposal_data, 64, 8)))
-        status = arc4.UInt64(op.btoi(op.extract(proposal_data, 80, 8)))
-        approvals = arc4.UInt64(op.btoi(op.extract(proposal_data, 88, 8)))
+        creator = arc4.Address(op.extract(meta_data, 0, 32))
+        recipient = arc4.Address(op.extract(meta_data, 32, 32))
+        amount = arc4.UInt64(op.btoi(op.extract(meta_data, 64, 8)))
+        status = arc4.UInt64(op.getbyte(self.proposal_status[key], 0))
+        approvals = arc4.UInt64(self._popcount(self._current_votes(proposal_id.native, self.proposal_votes[key])))
         
         return arc4.Tuple((creator, recipient, amount, status, approvals))
     
+    @arc4.abimethod
+    def get_proposal_raw(self, proposal_id: arc4.UInt64) -> arc4.DynamicBytes:
+        """
+        Get a proposal's stored bytes, undecoded.
+        
+        Cheaper than get_proposal when the client decodes it anyway.
+        
+        Args:
+            proposal_id: ID of the proposal
+            
+        Returns:
+            creator (32) + recipient (32) + amount (8) + status (1) + vote bitmap (8)
+        """
+        key = self._proposal_key(proposal_id.native)
+        meta_data, proposal_exists = self.proposal_meta.maybe(key)
+        assert proposal_exists, "Proposal does not exist"
+        
+        votes = self._current_votes(proposal_id.native, self.proposal_votes[key])
+        return arc4.DynamicBytes(meta_data + self.proposal_status[key] + op.itob(votes))
+    
     @arc4.abimethod
     def get_treasury_info(self) -> arc4.Tuple[arc4.UInt64, arc4.UInt64, arc4.UInt64, arc4.UInt64]:
         """
@@ -357,15 +554,11 @@ class DAOTreasury(ARC4Contract):
         Returns:
             Tuple of (threshold, signer_count, proposal_count, available_balance)
         """
-        app_balance = Global.current_application_address.balance
-        min_balance = Global.current_application_address.min_balance
-        available = app_balance - min_balance
-        
         return arc4.Tuple((
             arc4.UInt64(self.threshold.value),
             arc4.UInt64(self.signer_count.value),
             arc4.UInt64(self.proposal_count.value),
-            arc4.UInt64(available),
+            arc4.UInt64(self._available()),
         ))
     
     @arc4.abimethod
@@ -383,16 +576,16 @@ class DAOTreasury(ARC4Contract):
         
         self.threshold.value = new_threshold.native
     
-    @arc4.abimethod(allow_actions=["CloseOut"])
-    def close_out(self) -> None:
+    @arc4.abimethod
+    def resign(self) -> None:
         """
-        Close out from the treasury.
-        Signers can close out at any time.
+        Leave the treasury.
+        Signers can resign at any time.
         """
-        if self.is_signer[Txn.sender] == UInt64(1):
-            self.signer_count.value = self.signer_count.value - UInt64(1)
+        assert Txn.sender in self.signer_slot, "Not a signer"
         
-        self.is_signer[Txn.sender] = UInt64(0)
+        self.signer_count.value = self.signer_count.value - UInt64(1)
+        self._release_signer_slot(Txn.sender.bytes)
     
     @arc4.abimethod(allow_actions=["DeleteApplication"])
     def delete(self) -> None:
@@ -402,7 +595,137 @@ class DAOTreasury(ARC4Contract):
         """
         assert Txn.sender == self.creator.value, "Only creator can delete"
         
+        assert self._available() == UInt64(0), "Treasury must be empty"
+    
+    @subroutine
+    def _bls_verify(self, pubkey: Bytes, digest: Bytes, signature: Bytes) -> bool:
+        """
+        Verify a BLS signature (public key in G1, signature in G2).
+        
+        The 32-byte digest is embedded in an Fp2 element and mapped to G2;
+        off-chain signers must hash the message the same way.
+        """
+        ensure_budget(UInt64(BLS_VERIFY_BUDGET), OpUpFeeSource.GroupCredit)
+        
+        hashed = op.EllipticCurve.map_to(
+            op.EC.BLS12_381g2,
+            op.bzero(16) + digest + op.bzero(48),
+        )
+        return op.EllipticCurve.pairing_check(
+            op.EC.BLS12_381g1,
+            pubkey + BLS_G1_NEG_GENERATOR,
+            hashed + signature,
+        )
+    
+    @subroutine
+    def _proposal_key(self, proposal_id: UInt64) -> Bytes:
+        """Box key suffix for a proposal: its id truncated to PROPOSAL_ID_BYTES."""
+        assert proposal_id >> UInt64(8 * PROPOSAL_ID_BYTES) == UInt64(0), "Proposal id out of range"
+        return op.extract(op.itob(proposal_id), 8 - PROPOSAL_ID_BYTES, PROPOSAL_ID_BYTES)
+    
+    @subroutine
+    def _pay_out(self, key: Bytes, meta_data: Bytes) -> None:
+        """
+        Pay a proposal's recipient and mark it executed.
+        
+        The inner payment's fee is pooled: the calling transaction must pay
+        an extra min fee so treasury funds aren't spent on fees.
+        """
+        # Extract recipient and amount
+        recipient_bytes = op.extract(meta_data, 32, 32)
+        amount = op.btoi(op.extract(meta_data, 64, 8))
+        
+        # Execute payment via inner transaction
+        itxn.Payment(
+            receiver=Account(recipient_bytes),
+            amount=amount,
+            fee=0,
+        ).submit()
+        
+        self._set_status(key, STATUS_EXECUTED)
+    
+    @subroutine
+    def _assert_pending(self, key: Bytes) -> None:
+        """
+        Fail unless the proposal exists and is still pending.
+        
+        Status only moves forward (pending to executed or rejected), so the
+        1-byte status box is the only state read to gate a transition.
+        """
+        status, proposal_exists = self.proposal_status.maybe(key)
+        assert proposal_exists, "Proposal does not exist"
+        assert op.getbyte(status, 0) == STATUS_PENDING, "Proposal not pending"
+    
+    @subroutine
+    def _set_status(self, key: Bytes, status: UInt64) -> None:
+        """Overwrite a proposal's status in place; the box must already exist."""
+        op.Box.replace(self.proposal_status.key_prefix + key, 0, op.extract(op.itob(status), 7, 1))
+    
+    @subroutine
+    def _set_votes(self, key: Bytes, votes: UInt64) -> None:
+        """Overwrite a proposal's vote bitmap in place; the box must already exist."""
+        op.Box.replace(self.proposal_votes.key_prefix + key, 0, op.itob(votes))
+    
+    @subroutine
+    def _popcount(self, x: UInt64) -> UInt64:
+        """Count the set bits of a vote bitmap (SWAR, constant time)."""
+        x = x - ((x >> 1) & UInt64(0x5555555555555555))
+        x = (x & UInt64(0x3333333333333333)) + ((x >> 2) & UInt64(0x3333333333333333))
+        x = (x + (x >> 4)) & UInt64(0x0F0F0F0F0F0F0F0F)
+        # Byte sums fit in 7 bits; fold them with shifts since the usual
+        # multiply by 0x0101010101010101 would overflow and fail on the AVM
+        x = x + (x >> 8)
+        x = x + (x >> 16)
+        x = x + (x >> 32)
+        return x & UInt64(0x7F)
+    
+    @subroutine
+    def _available(self) -> UInt64:
+        """Treasury balance above the app account's minimum balance."""
         app_balance = Global.current_application_address.balance
         min_balance = Global.current_application_address.min_balance
+        return app_balance - min_balance if app_balance > min_balance else UInt64(0)
+    
+    @subroutine
+    def _proposal_digest(self, proposal_id: UInt64, meta_data: Bytes) -> Bytes:
+        """
+        Message signed off-chain to approve a proposal.
         
-        assert app_balance <= min_balance, "Treasury must be empty"
+        Binds the app id so signatures can't be replayed against another treasury.
+        """
+        # Meta is creator + recipient + amount
+        return op.sha512_256(
+            op.itob(Global.current_application_id.id) + op.itob(proposal_id) + meta_data
+        )
+    
+    @subroutine
+    def _release_signer_slot(self, signer: Bytes) -> None:
+        """Zero a signer's packed slot and delete its slot index and BLS key."""
+        signer_account = Account(signer)
+        slot = self.signer_slot[signer_account]
+        del self.signer_slot[signer_account]
+        self.signers.replace(slot * ADDRESS_LENGTH, Global.zero_address.bytes)
+        # No proposal is newer than this, so all of the slot's votes are dropped
+        self.signer_since.replace(slot * 8, Bytes(b"\xff" * 8))
+        if slot in self.bls_keys:
+            del self.bls_keys[slot]
+    
+    @subroutine
+    def _current_votes(self, proposal_id: UInt64, votes: UInt64) -> UInt64:
+        """
+        Clear the vote bits of slots that changed hands since the proposal.
+        
+        Signers only vote on proposals created after they joined, so a bit
+        on an older proposal was set by a removed signer.
+        """
+        since = self.signer_since.extract(0, MAX_SIGNERS * 8)
+        for i in urange(MAX_SIGNERS):
+            if op.extract_uint64(since, i * 8) > proposal_id:
+                votes &= ~(UInt64(1) << i)
+        return votes
+    
+    @subroutine
+    def _assert_joined_before(self, slot: UInt64, proposal_id: UInt64) -> None:
+        """Fail if the signer in a slot joined after the proposal was created."""
+        since = op.btoi(self.signer_since.extract(slot * 8, 8))
+        assert since <= proposal_id, "Signer joined after proposal"
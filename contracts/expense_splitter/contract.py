@@ -7,13 +7,14 @@ and settle all debts atomically using Algorand's native Atomic Group feature.
 Features:
 - Create expense splits with member list
 - Track who paid for what
-- Calculate net balances for each member
+- Calculate net balances for each member from running paid totals
 - Settle all debts in a single atomic transaction group
 
 Algorand Primitives Used:
 - AVM Application (smart contract)
 - Atomic Groups (up to 16 transactions)
-- Local State (per-member balances)
+- Inner Transactions (creditor payouts on settlement)
+- Local State (membership)
 - Global State (split metadata)
 """
 
@@ -21,6 +22,8 @@ from algopy import (
     ARC4Contract,
     Account,
     Application,
+    OpUpFeeSource,
+    TransactionType,
     Asset,
     Bytes,
     Global,
@@ -35,6 +38,8 @@ from algopy import (
     subroutine,
     Box,
     BoxRef,
+    ensure_budget,
+    urange,
 )
 from algopy.arc4 import abimethod, Address, String, UInt64 as ARC4UInt64, DynamicArray
 
@@ -42,6 +47,12 @@ from algopy.arc4 import abimethod, Address, String, UInt64 as ARC4UInt64, Dynami
 # Maximum members in a split (Algorand atomic group limit)
 MAX_MEMBERS = 16
 
+# Opcode budget per (member, group transaction) pair scanned by settle
+SETTLE_BUDGET_PER_ENTRY = 40
+
+# Member box layout: address (32) + total paid (8)
+OFFSET_MEMBER_PAID = 32
+
 
 class ExpenseSplitter(ARC4Contract):
     """
@@ -56,25 +67,28 @@ class ExpenseSplitter(ARC4Contract):
         - total_pool: Total amount in the expense pool
         
     - Local State (per member):
-        - net_balance: Signed balance (positive = owed money, negative = owes money)
         - has_opted_in: Whether member has joined the split
+        - member_index: Index of the member's box
         
     - Boxes:
-        - members: List of member addresses
-        - expenses: Log of all expenses
-    """
+        - {index}: Member address and total paid
     
-    # Global State
-    creator: GlobalState[Account]
-    member_count: GlobalState[UInt64]
-    expense_count: GlobalState[UInt64]
-    is_settled: GlobalState[UInt64]  # 0 = active, 1 = settled
-    total_pool: GlobalState[UInt64]
+    Balances are derived from each member's total paid and the pool, so
+    logging an expense touches only the payer's box, and settle reads one
+    box per member however many expenses were logged.
+    """
     
-    # Local State
-    net_balance: LocalState[UInt64]
-    balance_sign: LocalState[UInt64]  # 0 = positive (owed), 1 = negative (owes)
-    has_opted_in: LocalState[UInt64]
+    def __init__(self) -> None:
+        # Global State
+        self.creator = GlobalState(Account)
+        self.member_count = GlobalState(UInt64)
+        self.expense_count = GlobalState(UInt64)
+        self.is_settled = GlobalState(UInt64)  # 0 = active, 1 = settled
+        self.total_pool = GlobalState(UInt64)
+        
+        # Local State
+        self.has_opted_in = LocalState(UInt64)
+        self.member_index = LocalState(UInt64)
     
     @arc4.abimethod(create="require")
     def create(self) -> None:
@@ -98,17 +112,15 @@ class ExpenseSplitter(ARC4Contract):
         assert self.member_count.value < UInt64(MAX_MEMBERS), "Max members reached"
         
         # Initialize local state
-        self.net_balance[Txn.sender] = UInt64(0)
-        self.balance_sign[Txn.sender] = UInt64(0)
         self.has_opted_in[Txn.sender] = UInt64(1)
         
         # Increment member count
         self.member_count.value = self.member_count.value + UInt64(1)
         
-        # Store member address in box
+        # Store member address and a zero paid total in box
         member_index = self.member_count.value - UInt64(1)
-        box_key = op.itob(member_index)
-        op.Box.put(box_key, Txn.sender.bytes)
+        self.member_index[Txn.sender] = member_index
+        op.Box.put(op.itob(member_index), Txn.sender.bytes + op.itob(UInt64(0)))
     
     @arc4.abimethod
     def add_expense(
@@ -119,9 +131,8 @@ class ExpenseSplitter(ARC4Contract):
         """
         Log an expense paid by the caller.
         
-        The amount is distributed equally among all members.
-        The payer's balance increases (they are owed money).
-        Other members' balances decrease (they owe money).
+        The amount is distributed equally among all members and
+        settled by settle(); only the payer's paid total is updated.
         
         Args:
             amount: Amount paid in microALGOs
@@ -130,31 +141,9 @@ class ExpenseSplitter(ARC4Contract):
         assert self.is_settled.value == UInt64(0), "Split already settled"
         assert self.has_opted_in[Txn.sender] == UInt64(1), "Not a member"
         assert amount.native > UInt64(0), "Amount must be positive"
+        assert self.member_count.value > UInt64(0), "No members in split"
         
-        payer = Txn.sender
         expense_amount = amount.native
-        member_count = self.member_count.value
-        
-        assert member_count > UInt64(0), "No members in split"
-        
-        # Calculate share per member
-        share_per_member = expense_amount // member_count
-        
-        # Update payer's balance (they are owed: (n-1) * share)
-        payer_credit = share_per_member * (member_count - UInt64(1))
-        current_balance = self.net_balance[payer]
-        current_sign = self.balance_sign[payer]
-        
-        if current_sign == UInt64(0):
-            # Currently positive (owed money), add to it
-            self.net_balance[payer] = current_balance + payer_credit
-        else:
-            # Currently negative (owes money), reduce debt
-            if payer_credit >= current_balance:
-                self.net_balance[payer] = payer_credit - current_balance
-                self.balance_sign[payer] = UInt64(0)
-            else:
-                self.net_balance[payer] = current_balance - payer_credit
         
         # Update total pool
         self.total_pool.value = self.total_pool.value + expense_amount
@@ -162,46 +151,49 @@ class ExpenseSplitter(ARC4Contract):
         # Increment expense count
         self.expense_count.value = self.expense_count.value + UInt64(1)
         
-        # Store expense in box
-        expense_index = self.expense_count.value - UInt64(1)
-        expense_key = Bytes(b"exp_") + op.itob(expense_index)
-        expense_data = payer.bytes + op.itob(expense_amount)
-        op.Box.put(expense_key, expense_data)
+        # Add to the payer's paid total
+        member_key = op.itob(self.member_index[Txn.sender])
+        paid = op.btoi(op.Box.extract(member_key, OFFSET_MEMBER_PAID, 8))
+        op.Box.replace(member_key, OFFSET_MEMBER_PAID, op.itob(paid + expense_amount))
     
     @arc4.abimethod
-    def update_member_debt(
-        self,
-        member: arc4.Address,
-        share: arc4.UInt64,
-    ) -> None:
+    def settle(self) -> None:
         """
-        Update a member's debt when an expense is added.
-        Called separately due to transaction limits.
+        Settle all debts in one call.
         
-        Args:
-            member: Member address to update
-            share: Share amount they owe
+        Debtors must pay what they owe to the app account in the same
+        group; each creditor is then paid out with an inner payment.
+        Inner transaction fees are pooled from the outer transaction.
+        Any member can settle.
         """
-        assert self.is_settled.value == UInt64(0), "Split already settled"
-        assert Txn.sender == self.creator.value, "Only creator can update"
-        
-        member_account = Account(member.bytes)
-        assert self.has_opted_in[member_account] == UInt64(1), "Not a member"
+        assert self.is_settled.value == UInt64(0), "Already settled"
+        assert self.has_opted_in[Txn.sender] == UInt64(1), "Not a member"
         
-        share_amount = share.native
-        current_balance = self.net_balance[member_account]
-        current_sign = self.balance_sign[member_account]
+        member_count = self.member_count.value
+        ensure_budget(
+            member_count * Global.group_size * UInt64(SETTLE_BUDGET_PER_ENTRY),
+            OpUpFeeSource.GroupCredit,
+        )
         
-        if current_sign == UInt64(1):
-            # Already negative (owes money), add to debt
-            self.net_balance[member_account] = current_balance + share_amount
-        else:
-            # Currently positive or zero
-            if share_amount > current_balance:
-                self.net_balance[member_account] = share_amount - current_balance
-                self.balance_sign[member_account] = UInt64(1)
+        for i in urange(member_count):
+            member_data, member_exists = op.Box.get(op.itob(i))
+            assert member_exists, "Member box missing"
+            
+            member_bytes = op.extract(member_data, 0, 32)
+            balance, is_owed = self._net_balance(op.extract_uint64(member_data, OFFSET_MEMBER_PAID))
+            if balance == UInt64(0):
+                continue
+            
+            if is_owed:
+                itxn.Payment(
+                    receiver=Account(member_bytes),
+                    amount=balance,
+                    fee=0,
+                ).submit()
             else:
-                self.net_balance[member_account] = current_balance - share_amount
+                assert self._paid_in(member_bytes) >= balance, "Debtor has not paid in"
+        
+        self.is_settled.value = UInt64(1)
     
     @arc4.abimethod
     def get_balance(self, member: arc4.Address) -> arc4.Tuple[arc4.UInt64, arc4.Bool]:
@@ -216,13 +208,13 @@ class ExpenseSplitter(ARC4Contract):
             - is_owed = True means member is owed money
             - is_owed = False means member owes money
         """
-        member_account = Account(member.bytes)
-        balance = self.net_balance[member_account]
-        sign = self.balance_sign[member_account]
-        
-        is_owed = arc4.Bool(sign == UInt64(0))
+        index, is_member = self.member_index.maybe(Account(member.bytes))
+        paid = UInt64(0)
+        if is_member:
+            paid = op.btoi(op.Box.extract(op.itob(index), OFFSET_MEMBER_PAID, 8))
+        balance, is_owed = self._net_balance(paid)
         
-        return arc4.Tuple((arc4.UInt64(balance), is_owed))
+        return arc4.Tuple((arc4.UInt64(balance), arc4.Bool(is_owed)))
     
     @arc4.abimethod
     def get_split_info(self) -> arc4.Tuple[arc4.UInt64, arc4.UInt64, arc4.UInt64, arc4.Bool]:
@@ -259,8 +251,6 @@ class ExpenseSplitter(ARC4Contract):
         assert self.is_settled.value == UInt64(1), "Split not yet settled"
         
         # Clear local state
-        self.net_balance[Txn.sender] = UInt64(0)
-        self.balance_sign[Txn.sender] = UInt64(0)
         self.has_opted_in[Txn.sender] = UInt64(0)
     
     @arc4.abimethod(allow_actions=["DeleteApplication"])
@@ -271,3 +261,40 @@ class ExpenseSplitter(ARC4Contract):
         """
         assert Txn.sender == self.creator.value, "Only creator can delete"
         assert self.is_settled.value == UInt64(1), "Must settle first"
+    
+    @subroutine
+    def _net_balance(self, paid: UInt64) -> tuple[UInt64, bool]:
+        """
+        Derive a member's balance from their total paid.
+        
+        Each member's fair share is total_pool / member_count. Creditors
+        are owed rounded down and debtors owe rounded up, so payouts never
+        exceed what debtors pay in; any remainder stays in the pool.
+        
+        Returns:
+            Tuple of (balance amount, is_owed)
+        """
+        member_count = self.member_count.value
+        if member_count == UInt64(0):
+            return UInt64(0), True
+        
+        # Compared scaled by member_count to keep the division exact
+        scaled_paid = paid * member_count
+        total_pool = self.total_pool.value
+        if scaled_paid >= total_pool:
+            return (scaled_paid - total_pool) // member_count, True
+        return (total_pool - scaled_paid + member_count - UInt64(1)) // member_count, False
+    
+    @subroutine
+    def _paid_in(self, member: Bytes) -> UInt64:
+        """Sum of payments from a member to the app account in the current group."""
+        paid = UInt64(0)
+        for g in urange(Global.group_size):
+            txn = gtxn.Transaction(g)
+            if (
+                txn.type == TransactionType.Payment
+                and txn.sender.bytes == member
+                and txn.receiver == Global.current_application_address
+            ):
+                paid += txn.amount
+        return paid
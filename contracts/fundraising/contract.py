@@ -29,9 +29,12 @@ from algopy import (
     Txn,
     UInt64,
     arc4,
+    gtxn,
     itxn,
     op,
     Box,
+    subroutine,
+    urange,
 )
 from algopy.arc4 import abimethod, Address, String, UInt64 as ARC4UInt64, Bool
 
@@ -42,6 +45,111 @@ STATUS_SUCCESSFUL = UInt64(1)
 STATUS_FAILED = UInt64(2)
 STATUS_CANCELLED = UInt64(3)
 
+# Campaign box layout (CAMPAIGN_SIZE bytes)
+CAMPAIGN_SIZE = 112
+OFFSET_CREATOR = 0
+OFFSET_BENEFICIARY = 32
+OFFSET_GOAL = 64
+OFFSET_RAISED = 72
+OFFSET_DEADLINE = 80
+OFFSET_STATUS = 88
+OFFSET_MILESTONE_COUNT = 96
+OFFSET_DONATION_COUNT = 104
+
+# Milestone box layout (17 bytes); the completed flag is a single byte
+OFFSET_MILESTONE_AMOUNT = 0
+OFFSET_MILESTONE_RELEASED = 8
+OFFSET_MILESTONE_COMPLETED = 16
+MILESTONE_PENDING = Bytes(b"\x00")
+MILESTONE_COMPLETE = Bytes(b"\x01")
+
+# Donation log entry layout: donor (32) + amount (8) + seconds before deadline (4)
+DONATION_RECORD_SIZE = 44
+MAX_DEADLINE_DELTA = 0xFFFF_FFFF
+
+# The log is paged so each page fits the 1KB a single box reference
+# covers: 23 records (1012 bytes), page = donation index // 23
+DONATIONS_PER_PAGE = 23
+DONATION_PAGE_SIZE = DONATIONS_PER_PAGE * DONATION_RECORD_SIZE
+
+# Most donations batch_donate folds into one call (opcode budget)
+MAX_BATCH_DONATIONS = 16
+
+
+# Box keys: a 1-byte type tag followed by fixed-width fields
+CAMPAIGN_TAG = Bytes(b"\x00")
+MILESTONE_TAG = Bytes(b"\x01")
+DONATION_LOG_TAG = Bytes(b"\x02")
+DONOR_TAG = Bytes(b"\x03")
+REFUND_TAG = Bytes(b"\x04")
+REFUNDS_ENABLED = Bytes(b"\x01")
+
+
+@subroutine
+def _campaign_key(campaign_id: UInt64) -> Bytes:
+    """Box key for a campaign record."""
+    return CAMPAIGN_TAG + op.itob(campaign_id)
+
+
+@subroutine
+def _existing_campaign_key(campaign_id: UInt64) -> Bytes:
+    """Box key for a campaign record, failing if the campaign does not exist."""
+    campaign_key = _campaign_key(campaign_id)
+    _, campaign_exists = op.Box.length(campaign_key)
+    assert campaign_exists, "Campaign does not exist"
+    return campaign_key
+
+
+@subroutine
+def _milestone_key(campaign_id: UInt64, milestone_index: UInt64) -> Bytes:
+    """Box key for a campaign milestone."""
+    return MILESTONE_TAG + op.itob(campaign_id) + op.itob(milestone_index)
+
+
+@subroutine
+def _donation_log_key(campaign_id: UInt64, page: UInt64) -> Bytes:
+    """Box key for a page of a campaign's append-only donation log."""
+    return DONATION_LOG_TAG + op.itob(campaign_id) + op.itob(page)
+
+
+@subroutine
+def _donor_key(campaign_id: UInt64, donor: Bytes) -> Bytes:
+    """
+    Box key for a donor's running total.
+    
+    The fixed 9-byte prefix (tag + campaign id) lets off-chain indexers list
+    every donor of a campaign with a single box-name prefix query.
+    """
+    return DONOR_TAG + op.itob(campaign_id) + donor
+
+
+@subroutine
+def _refund_key(campaign_id: UInt64) -> Bytes:
+    """Box key for a campaign's refunds-enabled flag."""
+    return REFUND_TAG + op.itob(campaign_id)
+
+
+@subroutine
+def _available() -> UInt64:
+    """Escrow balance above the app account's minimum balance."""
+    app_address = Global.current_application_address
+    return app_address.balance - app_address.min_balance
+
+
+@subroutine
+def _log_donation(campaign_id: UInt64, donation_index: UInt64, record: Bytes) -> None:
+    """Write a donation record to its log page, creating the page for its first record."""
+    log_key = _donation_log_key(campaign_id, donation_index // UInt64(DONATIONS_PER_PAGE))
+    # No-op if the page already exists
+    op.Box.create(log_key, DONATION_PAGE_SIZE)
+    op.Box.replace(log_key, (donation_index % UInt64(DONATIONS_PER_PAGE)) * DONATION_RECORD_SIZE, record)
+
+
+@subroutine
+def _time_before(deadline: UInt64) -> Bytes:
+    """Seconds from now until the deadline as 4 bytes, for donation records."""
+    return op.extract(op.itob(deadline - Global.latest_timestamp), 4, 4)
+
 
 class FundraisingEscrow(ARC4Contract):
     """
@@ -50,23 +158,44 @@ class FundraisingEscrow(ARC4Contract):
     State Schema:
     - Global State:
         - campaign_count: Total campaigns created
-        
-    - Boxes:
-        - campaign_{id}: Campaign details
-        - milestone_{campaign_id}_{index}: Milestone details
-        - donation_{campaign_id}_{index}: Donation records
-        - donor_{campaign_id}_{address}: Donor totals for refunds
+        - aggregator: Account trusted to submit batched donations
+        
+    - Boxes (keys are a type tag + fixed-width fields, see _*_key):
+        - 0x00 + campaign_id: Campaign details
+        - 0x01 + campaign_id + index: Milestone details
+        - 0x02 + campaign_id + page: Donation log, 23 44-byte records per page
+        - 0x03 + campaign_id + address: Donor totals for refunds
+        - 0x04 + campaign_id: Refunds-enabled flag, set when a campaign fails
     """
     
-    # Global State
-    campaign_count: GlobalState[UInt64]
+    def __init__(self) -> None:
+        # Global State
+        self.campaign_count = GlobalState(UInt64)
+        self.aggregator = GlobalState(Account)
     
     @arc4.abimethod(create="require")
     def create(self) -> None:
         """
         Create the fundraising contract.
+        The creator is the initial donation aggregator.
         """
         self.campaign_count.value = UInt64(0)
+        self.aggregator.value = Txn.sender
+    
+    @arc4.abimethod
+    def set_aggregator(
+        self,
+        aggregator: arc4.Address,
+    ) -> None:
+        """
+        Hand the aggregator role to another account.
+        Only the current aggregator can do this.
+        
+        Args:
+            aggregator: New aggregator address
+        """
+        assert Txn.sender == self.aggregator.value, "Only aggregator can reassign"
+        self.aggregator.value = aggregator.native
     
     @arc4.abimethod
     def create_campaign(
@@ -92,6 +221,8 @@ class FundraisingEscrow(ARC4Contract):
         """
         assert goal.native > UInt64(0), "Goal must be positive"
         assert deadline.native > Global.latest_timestamp, "Deadline must be future"
+        # Donation times are logged as 4-byte offsets from the deadline
+        assert deadline.native - Global.latest_timestamp <= MAX_DEADLINE_DELTA, "Deadline too far"
         
         campaign_id = self.campaign_count.value
         self.campaign_count.value = campaign_id + UInt64(1)
@@ -99,18 +230,18 @@ class FundraisingEscrow(ARC4Contract):
         # Store campaign in box
         # Format: creator (32) + beneficiary (32) + goal (8) + raised (8) + 
         #         deadline (8) + status (8) + milestone_count (8) + donation_count (8)
-        campaign_key = Bytes(b"camp_") + op.itob(campaign_id)
-        campaign_data = (
-            Txn.sender.bytes +           # Creator
+        # The box is created zeroed, which already encodes raised = 0,
+        # status = STATUS_ACTIVE and both counts = 0; only the rest is written
+        campaign_key = _campaign_key(campaign_id)
+        op.Box.create(campaign_key, CAMPAIGN_SIZE)
+        op.Box.replace(
+            campaign_key,
+            OFFSET_CREATOR,
+            Txn.sender.bytes +            # Creator
             beneficiary.bytes +           # Beneficiary
-            op.itob(goal.native) +        # Goal
-            op.itob(UInt64(0)) +          # Raised (starts at 0)
-            op.itob(deadline.native) +    # Deadline
-            op.itob(STATUS_ACTIVE) +      # Status
-            op.itob(UInt64(0)) +          # Milestone count
-            op.itob(UInt64(0))            # Donation count
+            op.itob(goal.native),         # Goal
         )
-        op.Box.put(campaign_key, campaign_data)
+        op.Box.replace(campaign_key, OFFSET_DEADLINE, op.itob(deadline.native))
         
         return arc4.UInt64(campaign_id)
     
@@ -134,44 +265,31 @@ class FundraisingEscrow(ARC4Contract):
             Milestone index
         """
         # Get campaign
-        campaign_key = Bytes(b"camp_") + op.itob(campaign_id.native)
-        campaign_exists, campaign_data = op.Box.get(campaign_key)
-        assert campaign_exists, "Campaign does not exist"
+        campaign_key = _existing_campaign_key(campaign_id.native)
         
         # Verify caller is creator
-        creator = op.extract(campaign_data, 0, 32)
+        creator = op.Box.extract(campaign_key, OFFSET_CREATOR, 32)
         assert Txn.sender.bytes == creator, "Only creator can add milestones"
         
         # Check campaign is still active
-        status = op.btoi(op.extract(campaign_data, 88, 8))
+        status = op.btoi(op.Box.extract(campaign_key, OFFSET_STATUS, 8))
         assert status == STATUS_ACTIVE, "Campaign not active"
         
         # Get current milestone count
-        milestone_count = op.btoi(op.extract(campaign_data, 96, 8))
+        milestone_count = op.btoi(op.Box.extract(campaign_key, OFFSET_MILESTONE_COUNT, 8))
         
         # Store milestone
-        # Format: amount (8) + released (8) + completed (8)
-        milestone_key = (
-            Bytes(b"mile_") + 
-            op.itob(campaign_id.native) + 
-            Bytes(b"_") + 
-            op.itob(milestone_count)
-        )
+        # Format: amount (8) + released (8) + completed (1)
+        milestone_key = _milestone_key(campaign_id.native, milestone_count)
         milestone_data = (
             op.itob(amount.native) +  # Amount to release
             op.itob(UInt64(0)) +      # Amount released so far
-            op.itob(UInt64(0))        # Completed flag (0 = pending, 1 = complete)
+            MILESTONE_PENDING         # Completed flag (0 = pending, 1 = complete)
         )
         op.Box.put(milestone_key, milestone_data)
         
         # Update campaign milestone count
-        new_count = milestone_count + UInt64(1)
-        updated_campaign = (
-            op.extract(campaign_data, 0, 96) +  # Keep first 96 bytes
-            op.itob(new_count) +                 # Update milestone count
-            op.extract(campaign_data, 104, 8)    # Keep donation count
-        )
-        op.Box.put(campaign_key, updated_campaign)
+        op.Box.replace(campaign_key, OFFSET_MILESTONE_COUNT, op.itob(milestone_count + UInt64(1)))
         
         return arc4.UInt64(milestone_count)
     
@@ -192,57 +310,103 @@ class FundraisingEscrow(ARC4Contract):
             anonymous: If true, encrypt donor info in note field
         """
         # Get campaign
-        campaign_key = Bytes(b"camp_") + op.itob(campaign_id.native)
-        campaign_exists, campaign_data = op.Box.get(campaign_key)
-        assert campaign_exists, "Campaign does not exist"
+        campaign_key = _existing_campaign_key(campaign_id.native)
         
         # Check campaign is active and before deadline
-        status = op.btoi(op.extract(campaign_data, 88, 8))
-        deadline = op.btoi(op.extract(campaign_data, 80, 8))
+        status = op.btoi(op.Box.extract(campaign_key, OFFSET_STATUS, 8))
+        deadline = op.btoi(op.Box.extract(campaign_key, OFFSET_DEADLINE, 8))
         assert status == STATUS_ACTIVE, "Campaign not active"
         assert Global.latest_timestamp < deadline, "Campaign ended"
         
         # Get current raised amount and donation count
-        raised = op.btoi(op.extract(campaign_data, 72, 8))
-        donation_count = op.btoi(op.extract(campaign_data, 104, 8))
-        
-        # Update raised amount
-        new_raised = raised + amount.native
-        
-        # Update campaign
-        updated_campaign = (
-            op.extract(campaign_data, 0, 72) +   # Keep first 72 bytes
-            op.itob(new_raised) +                 # Update raised
-            op.extract(campaign_data, 80, 24) +   # Keep deadline, status, milestone_count
-            op.itob(donation_count + UInt64(1))   # Increment donation count
-        )
-        op.Box.put(campaign_key, updated_campaign)
-        
-        # Store donation record (for transparency)
-        donation_key = (
-            Bytes(b"don_") +
-            op.itob(campaign_id.native) +
-            Bytes(b"_") +
-            op.itob(donation_count)
-        )
+        raised = op.btoi(op.Box.extract(campaign_key, OFFSET_RAISED, 8))
+        donation_count = op.btoi(op.Box.extract(campaign_key, OFFSET_DONATION_COUNT, 8))
         
-        # If anonymous, store encrypted placeholder; else store address
-        if anonymous.native:
-            donor_record = Bytes(b"anonymous") + op.itob(amount.native) + op.itob(Global.latest_timestamp)
-        else:
-            donor_record = Txn.sender.bytes + op.itob(amount.native) + op.itob(Global.latest_timestamp)
+        # Update raised amount and donation count in place
+        op.Box.replace(campaign_key, OFFSET_RAISED, op.itob(raised + amount.native))
+        op.Box.replace(campaign_key, OFFSET_DONATION_COUNT, op.itob(donation_count + UInt64(1)))
         
-        op.Box.put(donation_key, donor_record)
+        # Append donation record to the campaign's log (for transparency)
+        # If anonymous, record the zero address; else record the donor
+        donor = op.select_bytes(Txn.sender.bytes, Global.zero_address.bytes, anonymous.native)
+        donor_record = donor + op.itob(amount.native) + _time_before(deadline)
+        _log_donation(campaign_id.native, donation_count, donor_record)
         
         # Track donor total for potential refunds
-        donor_key = Bytes(b"donor_") + op.itob(campaign_id.native) + Txn.sender.bytes
-        donor_exists, donor_data = op.Box.get(donor_key)
+        # A missing box reads as empty bytes, which btoi decodes as 0
+        donor_key = _donor_key(campaign_id.native, Txn.sender.bytes)
+        donor_data, _ = op.Box.get(donor_key)
+        op.Box.put(donor_key, op.itob(op.btoi(donor_data) + amount.native))
+    
+    @arc4.abimethod
+    def batch_donate(
+        self,
+        campaign_id: arc4.UInt64,
+        payment_txn_index: arc4.UInt64,
+        donors: arc4.DynamicArray[arc4.Address],
+        amounts: arc4.DynamicArray[arc4.UInt64],
+    ) -> None:
+        """
+        Record several donations to a campaign in one call.
+        Only the aggregator can batch donations, and must be preceded
+        in the group by its payment of the combined amount to the app
+        account.
         
-        if donor_exists:
-            current_total = op.btoi(donor_data)
-            op.Box.put(donor_key, op.itob(current_total + amount.native))
-        else:
-            op.Box.put(donor_key, op.itob(amount.native))
+        The campaign totals are read and written once for the whole batch.
+        
+        Args:
+            campaign_id: ID of the campaign
+            payment_txn_index: Index of payment txn in group (this call's index - 1)
+            donors: Donor addresses
+            amounts: Donation amounts in microALGOs, one per donor
+        """
+        assert Txn.sender == self.aggregator.value, "Only aggregator can batch donate"
+        
+        batch_size = donors.length
+        assert batch_size == amounts.length, "Donor and amount count mismatch"
+        assert batch_size <= UInt64(MAX_BATCH_DONATIONS), "Batch too large"
+        
+        # Get campaign
+        campaign_key = _existing_campaign_key(campaign_id.native)
+        
+        # Check campaign is active and before deadline
+        status = op.btoi(op.Box.extract(campaign_key, OFFSET_STATUS, 8))
+        deadline = op.btoi(op.Box.extract(campaign_key, OFFSET_DEADLINE, 8))
+        assert status == STATUS_ACTIVE, "Campaign not active"
+        assert Global.latest_timestamp < deadline, "Campaign ended"
+        
+        raised = op.btoi(op.Box.extract(campaign_key, OFFSET_RAISED, 8))
+        donation_count = op.btoi(op.Box.extract(campaign_key, OFFSET_DONATION_COUNT, 8))
+        
+        # The donors are credited with the aggregator's payment, which
+        # must sit right before this call and cover the whole batch
+        assert payment_txn_index.native + UInt64(1) == Txn.group_index, "Payment must precede the call"
+        payment = gtxn.PaymentTransaction(payment_txn_index.native)
+        assert payment.sender == Txn.sender, "Payment must come from the aggregator"
+        assert payment.receiver == Global.current_application_address, "Payment must go to the app"
+        total_added = UInt64(0)
+        for i in urange(batch_size):
+            total_added += amounts[i].native
+        assert payment.amount == total_added, "Payment must equal the batch total"
+        
+        for i in urange(batch_size):
+            donor = donors[i].bytes
+            amount = amounts[i].native
+            
+            _log_donation(
+                campaign_id.native,
+                donation_count + i,
+                donor + op.itob(amount) + _time_before(deadline),
+            )
+            
+            # Track donor total for potential refunds
+            donor_key = _donor_key(campaign_id.native, donor)
+            donor_data, _ = op.Box.get(donor_key)
+            op.Box.put(donor_key, op.itob(op.btoi(donor_data) + amount))
+        
+        # Single update of the campaign totals
+        op.Box.replace(campaign_key, OFFSET_RAISED, op.itob(raised + total_added))
+        op.Box.replace(campaign_key, OFFSET_DONATION_COUNT, op.itob(donation_count + batch_size))
     
     @arc4.abimethod
     def complete_milestone(
@@ -255,40 +419,31 @@ class FundraisingEscrow(ARC4Contract):
         Mark a milestone as complete.
         Only campaign creator can mark milestones complete.
         
+        Legacy two-step payout; prefer complete_and_release.
+        
         Args:
             campaign_id: ID of the campaign
             milestone_index: Index of the milestone
             proof: Proof/description of milestone completion
         """
         # Get campaign
-        campaign_key = Bytes(b"camp_") + op.itob(campaign_id.native)
-        campaign_exists, campaign_data = op.Box.get(campaign_key)
-        assert campaign_exists, "Campaign does not exist"
+        campaign_key = _existing_campaign_key(campaign_id.native)
         
         # Verify caller is creator
-        creator = op.extract(campaign_data, 0, 32)
+        creator = op.Box.extract(campaign_key, OFFSET_CREATOR, 32)
         assert Txn.sender.bytes == creator, "Only creator can complete milestones"
         
         # Get milestone
-        milestone_key = (
-            Bytes(b"mile_") + 
-            op.itob(campaign_id.native) + 
-            Bytes(b"_") + 
-            op.itob(milestone_index.native)
-        )
-        milestone_exists, milestone_data = op.Box.get(milestone_key)
+        milestone_key = _milestone_key(campaign_id.native, milestone_index.native)
+        _, milestone_exists = op.Box.length(milestone_key)
         assert milestone_exists, "Milestone does not exist"
         
         # Check not already completed
-        completed = op.btoi(op.extract(milestone_data, 16, 8))
+        completed = op.btoi(op.Box.extract(milestone_key, OFFSET_MILESTONE_COMPLETED, 1))
         assert completed == UInt64(0), "Milestone already completed"
         
         # Mark as completed
-        updated_milestone = (
-            op.extract(milestone_data, 0, 16) +  # Keep amount and released
-            op.itob(UInt64(1))                    # Mark completed
-        )
-        op.Box.put(milestone_key, updated_milestone)
+        op.Box.replace(milestone_key, OFFSET_MILESTONE_COMPLETED, MILESTONE_COMPLETE)
     
     @arc4.abimethod
     def release_funds(
@@ -300,38 +455,33 @@ class FundraisingEscrow(ARC4Contract):
         Release funds for a completed milestone to the beneficiary.
         Anyone can call this once milestone is marked complete.
         
+        Legacy two-step payout; prefer complete_and_release.
+        
         Args:
             campaign_id: ID of the campaign
             milestone_index: Index of the milestone
         """
         # Get campaign
-        campaign_key = Bytes(b"camp_") + op.itob(campaign_id.native)
-        campaign_exists, campaign_data = op.Box.get(campaign_key)
-        assert campaign_exists, "Campaign does not exist"
+        campaign_key = _existing_campaign_key(campaign_id.native)
         
-        beneficiary_bytes = op.extract(campaign_data, 32, 32)
+        beneficiary_bytes = op.Box.extract(campaign_key, OFFSET_BENEFICIARY, 32)
         
         # Get milestone
-        milestone_key = (
-            Bytes(b"mile_") + 
-            op.itob(campaign_id.native) + 
-            Bytes(b"_") + 
-            op.itob(milestone_index.native)
-        )
-        milestone_exists, milestone_data = op.Box.get(milestone_key)
+        milestone_key = _milestone_key(campaign_id.native, milestone_index.native)
+        milestone_data, milestone_exists = op.Box.get(milestone_key)
         assert milestone_exists, "Milestone does not exist"
         
         # Check milestone is completed
-        completed = op.btoi(op.extract(milestone_data, 16, 8))
+        completed = op.getbyte(milestone_data, OFFSET_MILESTONE_COMPLETED)
         assert completed == UInt64(1), "Milestone not completed"
         
         # Check funds not already released
-        amount = op.btoi(op.extract(milestone_data, 0, 8))
-        released = op.btoi(op.extract(milestone_data, 8, 8))
+        amount = op.btoi(op.extract(milestone_data, OFFSET_MILESTONE_AMOUNT, 8))
+        released = op.btoi(op.extract(milestone_data, OFFSET_MILESTONE_RELEASED, 8))
         assert released == UInt64(0), "Funds already released"
         
         # Check contract has sufficient balance
-        available = Global.current_application_address.balance - Global.current_application_address.min_balance
+        available = _available()
         assert amount <= available, "Insufficient funds"
         
         # Release funds via inner transaction
@@ -342,12 +492,54 @@ class FundraisingEscrow(ARC4Contract):
         ).submit()
         
         # Mark funds as released
-        updated_milestone = (
-            op.extract(milestone_data, 0, 8) +  # Keep amount
-            op.itob(amount) +                    # Mark as released
-            op.extract(milestone_data, 16, 8)   # Keep completed flag
-        )
-        op.Box.put(milestone_key, updated_milestone)
+        op.Box.replace(milestone_key, OFFSET_MILESTONE_RELEASED, op.itob(amount))
+    
+    @arc4.abimethod
+    def complete_and_release(
+        self,
+        campaign_id: arc4.UInt64,
+        milestone_index: arc4.UInt64,
+        proof: arc4.String,
+    ) -> None:
+        """
+        Mark a milestone complete and release its funds in one call.
+        Only campaign creator can complete milestones.
+        
+        Args:
+            campaign_id: ID of the campaign
+            milestone_index: Index of the milestone
+            proof: Proof/description of milestone completion
+        """
+        # Get campaign creator and beneficiary in one read
+        campaign_key = _existing_campaign_key(campaign_id.native)
+        
+        parties = op.Box.extract(campaign_key, OFFSET_CREATOR, 64)
+        assert Txn.sender.bytes == op.extract(parties, OFFSET_CREATOR, 32), "Only creator can complete milestones"
+        beneficiary_bytes = op.extract(parties, OFFSET_BENEFICIARY, 32)
+        
+        # Get milestone
+        milestone_key = _milestone_key(campaign_id.native, milestone_index.native)
+        milestone_data, milestone_exists = op.Box.get(milestone_key)
+        assert milestone_exists, "Milestone does not exist"
+        
+        completed = op.getbyte(milestone_data, OFFSET_MILESTONE_COMPLETED)
+        assert completed == UInt64(0), "Milestone already completed"
+        
+        amount = op.btoi(op.extract(milestone_data, OFFSET_MILESTONE_AMOUNT, 8))
+        
+        # Check contract has sufficient balance
+        available = _available()
+        assert amount <= available, "Insufficient funds"
+        
+        # Release funds via inner transaction
+        itxn.Payment(
+            receiver=Account(beneficiary_bytes),
+            amount=amount,
+            fee=Global.min_txn_fee,
+        ).submit()
+        
+        # Mark released and completed with one write (the two fields are adjacent)
+        op.Box.replace(milestone_key, OFFSET_MILESTONE_RELEASED, op.itob(amount) + MILESTONE_COMPLETE)
     
     @arc4.abimethod
     def finalize_campaign(
@@ -362,14 +554,12 @@ class FundraisingEscrow(ARC4Contract):
             campaign_id: ID of the campaign
         """
         # Get campaign
-        campaign_key = Bytes(b"camp_") + op.itob(campaign_id.native)
-        campaign_exists, campaign_data = op.Box.get(campaign_key)
-        assert campaign_exists, "Campaign does not exist"
+        campaign_key = _existing_campaign_key(campaign_id.native)
         
-        status = op.btoi(op.extract(campaign_data, 88, 8))
-        deadline = op.btoi(op.extract(campaign_data, 80, 8))
-        goal = op.btoi(op.extract(campaign_data, 64, 8))
-        raised = op.btoi(op.extract(campaign_data, 72, 8))
+        status = op.btoi(op.Box.extract(campaign_key, OFFSET_STATUS, 8))
+        deadline = op.btoi(op.Box.extract(campaign_key, OFFSET_DEADLINE, 8))
+        goal = op.btoi(op.Box.extract(campaign_key, OFFSET_GOAL, 8))
+        raised = op.btoi(op.Box.extract(campaign_key, OFFSET_RAISED, 8))
         
         assert status == STATUS_ACTIVE, "Campaign already finalized"
         assert Global.latest_timestamp >= deadline, "Campaign still active"
@@ -379,14 +569,10 @@ class FundraisingEscrow(ARC4Contract):
             new_status = STATUS_SUCCESSFUL
         else:
             new_status = STATUS_FAILED
+            op.Box.put(_refund_key(campaign_id.native), REFUNDS_ENABLED)
         
         # Update status
-        updated_campaign = (
-            op.extract(campaign_data, 0, 88) +  # Keep first 88 bytes
-            op.itob(new_status) +                # Update status
-            op.extract(campaign_data, 96, 16)    # Keep milestone_count and donation_count
-        )
-        op.Box.put(campaign_key, updated_campaign)
+        op.Box.replace(campaign_key, OFFSET_STATUS, op.itob(new_status))
     
     @arc4.abimethod
     def claim_refund(
@@ -400,24 +586,21 @@ class FundraisingEscrow(ARC4Contract):
         Args:
             campaign_id: ID of the campaign
         """
-        # Get campaign
-        campaign_key = Bytes(b"camp_") + op.itob(campaign_id.native)
-        campaign_exists, campaign_data = op.Box.get(campaign_key)
-        assert campaign_exists, "Campaign does not exist"
-        
-        status = op.btoi(op.extract(campaign_data, 88, 8))
-        assert status == STATUS_FAILED, "Campaign not failed"
+        # The flag box only exists once the campaign has failed, so the
+        # campaign record itself is not read until the refund is booked
+        _, refunds_enabled = op.Box.length(_refund_key(campaign_id.native))
+        assert refunds_enabled, "Campaign not failed"
         
         # Get donor's total
-        donor_key = Bytes(b"donor_") + op.itob(campaign_id.native) + Txn.sender.bytes
-        donor_exists, donor_data = op.Box.get(donor_key)
+        donor_key = _donor_key(campaign_id.native, Txn.sender.bytes)
+        donor_data, donor_exists = op.Box.get(donor_key)
         assert donor_exists, "No donation found"
         
         refund_amount = op.btoi(donor_data)
         assert refund_amount > UInt64(0), "Already refunded"
         
         # Check contract has sufficient balance
-        available = Global.current_application_address.balance - Global.current_application_address.min_balance
+        available = _available()
         assert refund_amount <= available, "Insufficient funds for refund"
         
         # Send refund
@@ -427,8 +610,46 @@ class FundraisingEscrow(ARC4Contract):
             fee=Global.min_txn_fee,
         ).submit()
         
-        # Mark as refunded
-        op.Box.put(donor_key, op.itob(UInt64(0)))
+        # Mark as refunded by deleting the donor box, returning its MBR,
+        # and track what is still owed to donors in the raised field
+        op.Box.delete(donor_key)
+        campaign_key = _campaign_key(campaign_id.native)
+        raised = op.btoi(op.Box.extract(campaign_key, OFFSET_RAISED, 8))
+        op.Box.replace(campaign_key, OFFSET_RAISED, op.itob(raised - refund_amount))
+    
+    @arc4.abimethod
+    def purge_failed_campaign(
+        self,
+        campaign_id: arc4.UInt64,
+    ) -> None:
+        """
+        Delete a failed campaign, its milestones and its refund flag once
+        every donor has been refunded, returning their box MBR to the contract.
+        Only campaign creator can purge. Donation records are kept.
+        
+        Args:
+            campaign_id: ID of the campaign
+        """
+        # Get campaign
+        campaign_key = _existing_campaign_key(campaign_id.native)
+        
+        # Verify caller is creator
+        creator = op.Box.extract(campaign_key, OFFSET_CREATOR, 32)
+        assert Txn.sender.bytes == creator, "Only creator can purge"
+        
+        status = op.btoi(op.Box.extract(campaign_key, OFFSET_STATUS, 8))
+        assert status == STATUS_FAILED, "Campaign not failed"
+        
+        # Refunds decrement raised, so zero means nothing is left to claim
+        raised = op.btoi(op.Box.extract(campaign_key, OFFSET_RAISED, 8))
+        assert raised == UInt64(0), "Refunds outstanding"
+        
+        milestone_count = op.btoi(op.Box.extract(campaign_key, OFFSET_MILESTONE_COUNT, 8))
+        for i in urange(milestone_count):
+            op.Box.delete(_milestone_key(campaign_id.native, i))
+        
+        op.Box.delete(_refund_key(campaign_id.native))
+        op.Box.delete(campaign_key)
     
     @arc4.abimethod
     def cancel_campaign(
@@ -443,24 +664,18 @@ class FundraisingEscrow(ARC4Contract):
             campaign_id: ID of the campaign
         """
         # Get campaign
-        campaign_key = Bytes(b"camp_") + op.itob(campaign_id.native)
-        campaign_exists, campaign_data = op.Box.get(campaign_key)
-        assert campaign_exists, "Campaign does not exist"
+        campaign_key = _existing_campaign_key(campaign_id.native)
         
         # Verify caller is creator
-        creator = op.extract(campaign_data, 0, 32)
+        creator = op.Box.extract(campaign_key, OFFSET_CREATOR, 32)
         assert Txn.sender.bytes == creator, "Only creator can cancel"
         
-        status = op.btoi(op.extract(campaign_data, 88, 8))
+        status = op.btoi(op.Box.extract(campaign_key, OFFSET_STATUS, 8))
         assert status == STATUS_ACTIVE, "Campaign not active"
         
         # Update status to failed (enables refunds)
-        updated_campaign = (
-            op.extract(campaign_data, 0, 88) +
-            op.itob(STATUS_FAILED) +
-            op.extract(campaign_data, 96, 16)
-        )
-        op.Box.put(campaign_key, updated_campaign)
+        op.Box.replace(campaign_key, OFFSET_STATUS, op.itob(STATUS_FAILED))
+        op.Box.put(_refund_key(campaign_id.native), REFUNDS_ENABLED)
     
     @arc4.abimethod
     def get_campaign(
@@ -476,18 +691,12 @@ class FundraisingEscrow(ARC4Contract):
         Returns:
             Tuple of (creator, beneficiary, goal, raised, deadline, status)
         """
-        campaign_key = Bytes(b"camp_") + op.itob(campaign_id.native)
-        campaign_exists, campaign_data = op.Box.get(campaign_key)
-        assert campaign_exists, "Campaign does not exist"
+        campaign_key = _existing_campaign_key(campaign_id.native)
         
-        return arc4.Tuple((
-            arc4.Address(op.extract(campaign_data, 0, 32)),    # creator
-            arc4.Address(op.extract(campaign_data, 32, 32)),   # beneficiary
-            arc4.UInt64(op.btoi(op.extract(campaign_data, 64, 8))),  # goal
-            arc4.UInt64(op.btoi(op.extract(campaign_data, 72, 8))),  # raised
-            arc4.UInt64(op.btoi(op.extract(campaign_data, 80, 8))),  # deadline
-            arc4.UInt64(op.btoi(op.extract(campaign_data, 88, 8))),  # status
-        ))
+        # Creator through status is already the ARC4 encoding of the tuple
+        return arc4.Tuple[arc4.Address, arc4.Address, arc4.UInt64, arc4.UInt64, arc4.UInt64, arc4.UInt64].from_bytes(
+            op.Box.extract(campaign_key, OFFSET_CREATOR, OFFSET_STATUS + 8)
+        )
     
     @arc4.abimethod
     def get_milestone(
@@ -505,19 +714,49 @@ class FundraisingEscrow(ARC4Contract):
         Returns:
             Tuple of (amount, released, is_completed)
         """
-        milestone_key = (
-            Bytes(b"mile_") + 
-            op.itob(campaign_id.native) + 
-            Bytes(b"_") + 
-            op.itob(milestone_index.native)
-        )
-        milestone_exists, milestone_data = op.Box.get(milestone_key)
+        milestone_key = _milestone_key(campaign_id.native, milestone_index.native)
+        milestone_data, milestone_exists = op.Box.get(milestone_key)
         assert milestone_exists, "Milestone does not exist"
         
         return arc4.Tuple((
-            arc4.UInt64(op.btoi(op.extract(milestone_data, 0, 8))),   # amount
-            arc4.UInt64(op.btoi(op.extract(milestone_data, 8, 8))),   # released
-            arc4.Bool(op.btoi(op.extract(milestone_data, 16, 8)) == UInt64(1)),  # completed
+            arc4.UInt64.from_bytes(op.extract(milestone_data, OFFSET_MILESTONE_AMOUNT, 8)),   # amount
+            arc4.UInt64.from_bytes(op.extract(milestone_data, OFFSET_MILESTONE_RELEASED, 8)),   # released
+            arc4.Bool(op.getbyte(milestone_data, OFFSET_MILESTONE_COMPLETED) == UInt64(1)),  # completed
+        ))
+    
+    @arc4.abimethod
+    def get_donation(
+        self,
+        campaign_id: arc4.UInt64,
+        donation_index: arc4.UInt64,
+    ) -> arc4.Tuple[arc4.Address, arc4.UInt64, arc4.UInt64]:
+        """
+        Get a donation record from the campaign's donation log.
+        
+        Args:
+            campaign_id: ID of the campaign
+            donation_index: Index of the donation
+            
+        Returns:
+            Tuple of (donor, amount, timestamp); donor is the zero
+            address for anonymous donations
+        """
+        campaign_key = _existing_campaign_key(campaign_id.native)
+        
+        donation_count = op.btoi(op.Box.extract(campaign_key, OFFSET_DONATION_COUNT, 8))
+        assert donation_index.native < donation_count, "Donation does not exist"
+        deadline = op.btoi(op.Box.extract(campaign_key, OFFSET_DEADLINE, 8))
+        
+        record = op.Box.extract(
+            _donation_log_key(campaign_id.native, donation_index.native // UInt64(DONATIONS_PER_PAGE)),
+            (donation_index.native % UInt64(DONATIONS_PER_PAGE)) * DONATION_RECORD_SIZE,
+            DONATION_RECORD_SIZE,
+        )
+        
+        return arc4.Tuple((
+            arc4.Address(op.extract(record, 0, 32)),    # donor
+            arc4.UInt64.from_bytes(op.extract(record, 32, 8)),  # amount
+            arc4.UInt64(deadline - op.btoi(op.extract(record, 40, 4))),  # timestamp
         ))
     
     @arc4.abimethod
@@ -544,10 +783,10 @@ class FundraisingEscrow(ARC4Contract):
         Returns:
             Total donation amount
         """
-        donor_key = Bytes(b"donor_") + op.itob(campaign_id.native) + Txn.sender.bytes
-        donor_exists, donor_data = op.Box.get(donor_key)
+        donor_key = _donor_key(campaign_id.native, Txn.sender.bytes)
+        donor_data, donor_exists = op.Box.get(donor_key)
         
         if donor_exists:
-            return arc4.UInt64(op.btoi(donor_data))
+            return arc4.UInt64.from_bytes(donor_data)
         else:
             return arc4.UInt64(0)
@@ -8,17 +8,51 @@ For gasless onboarding, we use Atomic Fee Pooling where a sponsor account
 covers the fees for new students.
 """
 
+import asyncio
+import time
+from copy import copy
+from urllib.parse import quote, urlencode
+
 from algosdk import transaction
 from algosdk.v2client import algod
 from typing import Optional
 
 
+class SuggestedParamsCache:
+    """
+    Reuse suggested params across a batch of transactions.
+    
+    Params are refetched from algod once they are older than `ttl`
+    seconds, which should stay well below the block time.
+    """
+    
+    def __init__(self, algod_client: algod.AlgodClient, ttl: float = 4.0):
+        self.algod_client = algod_client
+        self.ttl = ttl
+        self._params: Optional[transaction.SuggestedParams] = None
+        self._fetched_at = 0.0
+    
+    def get(self) -> transaction.SuggestedParams:
+        """
+        Get suggested params, fetching them only when the cache is stale.
+        
+        Returns:
+            A copy of the cached params, safe for the caller to mutate
+        """
+        now = time.monotonic()
+        if self._params is None or now - self._fetched_at >= self.ttl:
+            self._params = self.algod_client.suggested_params()
+            self._fetched_at = now
+        return copy(self._params)
+
+
 def create_payment_txn(
     sender: str,
     receiver: str,
     amount: int,
     algod_client: algod.AlgodClient,
     note: Optional[str] = None,
+    params: Optional[transaction.SuggestedParams] = None,
 ) -> transaction.PaymentTxn:
     """
     Create a simple ALGO payment transaction.
@@ -29,11 +63,14 @@ def create_payment_txn(
         amount: Amount in microALGOs (1 ALGO = 1,000,000 microALGOs)
         algod_client: Algorand client instance
         note: Optional transaction note
+        params: Optional suggested params to reuse across a batch;
+            fetched from algod when omitted
         
     Returns:
         Unsigned PaymentTxn
     """
-    params = algod_client.suggested_params()
+    if params is None:
+        params = algod_client.suggested_params()
     
     txn = transaction.PaymentTxn(
         sender=sender,
@@ -46,6 +83,38 @@ def create_payment_txn(
     return txn
 
 
+async def create_payment_txn_async(
+    sender: str,
+    receiver: str,
+    amount: int,
+    algod_client: algod.AlgodClient,
+    note: Optional[str] = None,
+    params: Optional[transaction.SuggestedParams] = None,
+) -> transaction.PaymentTxn:
+    """
+    Async variant of create_payment_txn.
+    
+    The blocking algod round-trip runs in a worker thread, so many payments
+    can be built concurrently with asyncio.gather.
+    
+    Args:
+        sender: Sender's Algorand address
+        receiver: Receiver's Algorand address
+        amount: Amount in microALGOs
+        algod_client: Algorand client instance
+        note: Optional transaction note
+        params: Optional suggested params to reuse across a batch;
+            fetched from algod when omitted
+        
+    Returns:
+        Unsigned PaymentTxn
+    """
+    if params is None:
+        params = await asyncio.to_thread(algod_client.suggested_params)
+    
+    return create_payment_txn(sender, receiver, amount, algod_client, note, params)
+
+
 def create_sponsored_payment_txn(
     sender: str,
     receiver: str,
@@ -53,6 +122,7 @@ def create_sponsored_payment_txn(
     sponsor: str,
     algod_client: algod.AlgodClient,
     note: Optional[str] = None,
+    params: Optional[transaction.SuggestedParams] = None,
 ) -> tuple[transaction.PaymentTxn, transaction.PaymentTxn]:
     """
     Create a sponsored (gasless) payment using Atomic Fee Pooling.
@@ -67,15 +137,17 @@ def create_sponsored_payment_txn(
         sponsor: Sponsor's address who pays the fees
         algod_client: Algorand client instance
         note: Optional transaction note
+        params: Optional suggested params to reuse across a batch;
+            fetched from algod when omitted
         
     Returns:
         Tuple of (sender_txn, sponsor_txn) to be grouped atomically
     """
-    params = algod_client.suggested_params()
-    min_fee = params.min_fee
+    if params is None:
+        params = algod_client.suggested_params()
     
-    # Sender's transaction with fee = 0
-    sender_params = params
+    # Sender's transaction with fee = 0 (copied so params is never mutated)
+    sender_params = copy(params)
     sender_params.fee = 0
     sender_params.flat_fee = True
     
@@ -88,8 +160,8 @@ def create_sponsored_payment_txn(
     )
     
     # Sponsor's transaction with fee = 2x min (covers both)
-    sponsor_params = algod_client.suggested_params()
-    sponsor_params.fee = min_fee * 2
+    sponsor_params = copy(params)
+    sponsor_params.fee = params.min_fee * 2
     sponsor_params.flat_fee = True
     
     # Sponsor sends 0 ALGO to themselves (just paying fees)
@@ -116,6 +188,7 @@ def create_asa_transfer_txn(
     amount: int,
     algod_client: algod.AlgodClient,
     note: Optional[str] = None,
+    params: Optional[transaction.SuggestedParams] = None,
 ) -> transaction.AssetTransferTxn:
     """
     Create an ASA (Algorand Standard Asset) transfer transaction.
@@ -127,11 +200,14 @@ def create_asa_transfer_txn(
         amount: Amount of the asset to transfer
         algod_client: Algorand client instance
         note: Optional transaction note
+        params: Optional suggested params to reuse across a batch;
+            fetched from algod when omitted
         
     Returns:
         Unsigned AssetTransferTxn
     """
-    params = algod_client.suggested_params()
+    if params is None:
+        params = algod_client.suggested_params()
     
     txn = transaction.AssetTransferTxn(
         sender=sender,
@@ -149,6 +225,7 @@ def create_opt_in_txn(
     account: str,
     asset_id: int,
     algod_client: algod.AlgodClient,
+    params: Optional[transaction.SuggestedParams] = None,
 ) -> transaction.AssetTransferTxn:
     """
     Create an ASA opt-in transaction.
@@ -159,11 +236,14 @@ def create_opt_in_txn(
         account: Account address to opt-in
         asset_id: The ASA ID to opt into
         algod_client: Algorand client instance
+        params: Optional suggested params to reuse across a batch;
+            fetched from algod when omitted
         
     Returns:
         Unsigned opt-in AssetTransferTxn
     """
-    params = algod_client.suggested_params()
+    if params is None:
+        params = algod_client.suggested_params()
     
     txn = transaction.AssetTransferTxn(
         sender=account,
@@ -196,17 +276,14 @@ def generate_payment_qr_data(
     Returns:
         Algorand payment URI string
     """
-    uri = f"algorand://{receiver}"
-    params = []
-    
-    if amount:
-        params.append(f"amount={amount}")
-    if asset_id:
-        params.append(f"asset={asset_id}")
-    if note:
-        params.append(f"note={note}")
-    
-    if params:
-        uri += "?" + "&".join(params)
+    # urlencode percent-encodes the note, so spaces and '&' stay intact
+    query = urlencode(
+        {
+            key: value
+            for key, value in (("amount", amount), ("asset", asset_id), ("note", note))
+            if value
+        },
+        quote_via=quote,
+    )
     
-    return uri
+    return f"algorand://{receiver}" + (f"?{query}" if query else "")
@@ -4,8 +4,50 @@ PyTeal Smart Contracts for Cresca Campus
 These contracts can be directly compiled to TEAL and deployed.
 """
 
+import hashlib
+import inspect
+import os
+import tempfile
+
+import pyteal
 from pyteal import *
 
+TEAL_VERSION = 8
+# Scratch-slot reuse, frame pointers and intc/bytec constant blocks
+OPTIMIZE_SCRATCH_SLOTS = True
+OPTIMIZE_FRAME_POINTERS = True
+ASSEMBLE_CONSTANTS = True
+TEAL_CACHE_DIR = "build/.teal_cache"
+
+
+def router(on_create, on_optin=None, on_closeout=None, on_delete=None, noop_methods=None):
+    """
+    Build an approval program's top-level dispatch.
+    
+    The on-completion action is loaded into scratch once, and NoOp calls are
+    dispatched on application_args[0] via noop_methods ({method name: handler}).
+    Actions or methods without a handler are rejected.
+    """
+    on_completion = ScratchVar(TealType.uint64)
+    
+    branches = [[Txn.application_id() == Int(0), on_create]]
+    for action, handler in (
+        (OnComplete.OptIn, on_optin),
+        (OnComplete.CloseOut, on_closeout),
+        (OnComplete.DeleteApplication, on_delete),
+    ):
+        if handler is not None:
+            branches.append([on_completion.load() == action, handler])
+    
+    if noop_methods:
+        method = Txn.application_args[0]
+        branches.append([
+            on_completion.load() == OnComplete.NoOp,
+            Cond(*[[method == Bytes(name), handler] for name, handler in noop_methods.items()]),
+        ])
+    
+    return Seq([on_completion.store(Txn.on_completion()), Cond(*branches)])
+
 
 def expense_splitter_approval():
     """
@@ -14,12 +56,27 @@ def expense_splitter_approval():
     Allows groups of up to 16 members to track and settle expenses atomically.
     """
     
-    # Global state keys
-    creator_key = Bytes("creator")
-    member_count_key = Bytes("member_count")
-    expense_count_key = Bytes("expense_count")
-    is_settled_key = Bytes("is_settled")
-    total_pool_key = Bytes("total_pool")
+    # Global state: a single 64-byte value under one key
+    # member_count (8) + expense_count (8) + is_settled (8) + total_pool (8) + creator (32)
+    state_key = Bytes("s")
+    member_count_offset = Int(0)
+    expense_count_offset = Int(8)
+    is_settled_offset = Int(16)
+    total_pool_offset = Int(24)
+    creator_offset = Int(32)
+    
+    # Methods load the packed state into scratch once and write it back once
+    state = ScratchVar(TealType.bytes)
+    load_state = state.store(App.globalGet(state_key))
+    save_state = App.globalPut(state_key, state.load())
+    
+    def get_field(offset):
+        return ExtractUint64(state.load(), offset)
+    
+    def set_field(offset, value):
+        return state.store(Replace(state.load(), offset, Itob(value)))
+    
+    creator = Extract(state.load(), creator_offset, Int(32))
     
     # Local state keys
     net_balance_key = Bytes("net_balance")
@@ -28,86 +85,106 @@ def expense_splitter_approval():
     
     # Create
     on_create = Seq([
-        App.globalPut(creator_key, Txn.sender()),
-        App.globalPut(member_count_key, Int(0)),
-        App.globalPut(expense_count_key, Int(0)),
-        App.globalPut(is_settled_key, Int(0)),
-        App.globalPut(total_pool_key, Int(0)),
+        # Zeroed counters followed by the creator
+        App.globalPut(state_key, Concat(BytesZero(creator_offset), Txn.sender())),
         Approve(),
     ])
     
     # Opt-in
     on_optin = Seq([
-        Assert(App.globalGet(is_settled_key) == Int(0)),
-        Assert(App.globalGet(member_count_key) < Int(16)),
+        load_state,
+        Assert(get_field(is_settled_offset) == Int(0)),
+        Assert(get_field(member_count_offset) < Int(16)),
         App.localPut(Txn.sender(), net_balance_key, Int(0)),
         App.localPut(Txn.sender(), balance_sign_key, Int(0)),
         App.localPut(Txn.sender(), has_opted_in_key, Int(1)),
-        App.globalPut(member_count_key, App.globalGet(member_count_key) + Int(1)),
+        set_field(member_count_offset, get_field(member_count_offset) + Int(1)),
+        save_state,
         Approve(),
     ])
     
-    # Add expense
-    expense_amount = Btoi(Txn.application_args[1])
-    member_count = App.globalGet(member_count_key)
-    share_per_member = expense_amount / member_count
-    payer_credit = share_per_member * (member_count - Int(1))
+    # Add expense: args are [b"add_expense", itob(amount), itob(share)], where
+    # share = amount // member_count is computed by the client
+    # Inputs and state are read once into scratch and reused below
+    expense_amount = ScratchVar(TealType.uint64)
+    member_count = ScratchVar(TealType.uint64)
+    share = ScratchVar(TealType.uint64)
+    payer_credit = ScratchVar(TealType.uint64)
+    payer_balance = ScratchVar(TealType.uint64)
+    payer_owes = ScratchVar(TealType.uint64)
     
     on_add_expense = Seq([
-        Assert(App.globalGet(is_settled_key) == Int(0)),
+        load_state,
+        Assert(get_field(is_settled_offset) == Int(0)),
         Assert(App.localGet(Txn.sender(), has_opted_in_key) == Int(1)),
-        Assert(expense_amount > Int(0)),
-        Assert(member_count > Int(0)),
+        expense_amount.store(Btoi(Txn.application_args[1])),
+        member_count.store(get_field(member_count_offset)),
+        Assert(expense_amount.load() > Int(0)),
+        Assert(member_count.load() > Int(0)),
         
-        # Update payer's balance
-        If(App.localGet(Txn.sender(), balance_sign_key) == Int(0),
-            App.localPut(Txn.sender(), net_balance_key, 
-                App.localGet(Txn.sender(), net_balance_key) + payer_credit),
-            If(payer_credit >= App.localGet(Txn.sender(), net_balance_key),
-                Seq([
-                    App.localPut(Txn.sender(), net_balance_key, 
-                        payer_credit - App.localGet(Txn.sender(), net_balance_key)),
-                    App.localPut(Txn.sender(), balance_sign_key, Int(0)),
-                ]),
-                App.localPut(Txn.sender(), net_balance_key,
-                    App.localGet(Txn.sender(), net_balance_key) - payer_credit),
-            )
+        # Check the client's share is the floored per-member split
+        share.store(Btoi(Txn.application_args[2])),
+        Assert(share.load() * member_count.load() <= expense_amount.load()),
+        Assert((share.load() + Int(1)) * member_count.load() > expense_amount.load()),
+        
+        # Payer is credited every other member's share
+        payer_credit.store(share.load() * (member_count.load() - Int(1))),
+        payer_balance.store(App.localGet(Txn.sender(), net_balance_key)),
+        payer_owes.store(App.localGet(Txn.sender(), balance_sign_key)),
+        
+        # Update payer's balance: one write per field, the credit is added to
+        # the signed balance and the magnitude/sign picked from the result
+        App.localPut(Txn.sender(), net_balance_key,
+            If(payer_owes.load() == Int(0),
+                payer_balance.load() + payer_credit.load(),
+                If(payer_credit.load() >= payer_balance.load(),
+                    payer_credit.load() - payer_balance.load(),
+                    payer_balance.load() - payer_credit.load(),
+                ),
+            ),
+        ),
+        App.localPut(Txn.sender(), balance_sign_key,
+            And(payer_owes.load() == Int(1), payer_balance.load() > payer_credit.load()),
         ),
         
-        App.globalPut(total_pool_key, App.globalGet(total_pool_key) + expense_amount),
-        App.globalPut(expense_count_key, App.globalGet(expense_count_key) + Int(1)),
+        set_field(total_pool_offset, get_field(total_pool_offset) + expense_amount.load()),
+        set_field(expense_count_offset, get_field(expense_count_offset) + Int(1)),
+        save_state,
         Approve(),
     ])
     
     # Mark settled
     on_mark_settled = Seq([
-        Assert(Txn.sender() == App.globalGet(creator_key)),
-        Assert(App.globalGet(is_settled_key) == Int(0)),
-        App.globalPut(is_settled_key, Int(1)),
+        load_state,
+        Assert(Txn.sender() == creator),
+        Assert(get_field(is_settled_offset) == Int(0)),
+        set_field(is_settled_offset, Int(1)),
+        save_state,
         Approve(),
     ])
     
     # Close out
     on_closeout = Seq([
-        Assert(App.globalGet(is_settled_key) == Int(1)),
+        load_state,
+        Assert(get_field(is_settled_offset) == Int(1)),
         Approve(),
     ])
     
     # Delete
     on_delete = Seq([
-        Assert(Txn.sender() == App.globalGet(creator_key)),
-        Assert(App.globalGet(is_settled_key) == Int(1)),
+        load_state,
+        Assert(Txn.sender() == creator),
+        Assert(get_field(is_settled_offset) == Int(1)),
         Approve(),
     ])
     
     # Route calls
-    program = Cond(
-        [Txn.application_id() == Int(0), on_create],
-        [Txn.on_completion() == OnComplete.OptIn, on_optin],
-        [Txn.on_completion() == OnComplete.CloseOut, on_closeout],
-        [Txn.on_completion() == OnComplete.DeleteApplication, on_delete],
-        [And(Txn.on_completion() == OnComplete.NoOp, Txn.application_args[0] == Bytes("add_expense")), on_add_expense],
-        [And(Txn.on_completion() == OnComplete.NoOp, Txn.application_args[0] == Bytes("mark_settled")), on_mark_settled],
+    program = router(
+        on_create,
+        on_optin=on_optin,
+        on_closeout=on_closeout,
+        on_delete=on_delete,
+        noop_methods={"add_expense": on_add_expense, "mark_settled": on_mark_settled},
     )
     
     return program
@@ -186,13 +263,12 @@ def dao_treasury_approval():
     ])
     
     # Route calls
-    program = Cond(
-        [Txn.application_id() == Int(0), on_create],
-        [Txn.on_completion() == OnComplete.OptIn, on_optin],
-        [Txn.on_completion() == OnComplete.CloseOut, on_closeout],
-        [Txn.on_completion() == OnComplete.DeleteApplication, on_delete],
-        [And(Txn.on_completion() == OnComplete.NoOp, Txn.application_args[0] == Bytes("add_signer")), on_add_signer],
-        [And(Txn.on_completion() == OnComplete.NoOp, Txn.application_args[0] == Bytes("create_proposal")), on_create_proposal],
+    program = router(
+        on_create,
+        on_optin=on_optin,
+        on_closeout=on_closeout,
+        on_delete=on_delete,
+        noop_methods={"add_signer": on_add_signer, "create_proposal": on_create_proposal},
     )
     
     return program
@@ -238,11 +314,10 @@ def soulbound_ticket_approval():
     ])
     
     # Route calls
-    program = Cond(
-        [Txn.application_id() == Int(0), on_create],
-        [Txn.on_completion() == OnComplete.DeleteApplication, on_delete],
-        [And(Txn.on_completion() == OnComplete.NoOp, Txn.application_args[0] == Bytes("create_event")), on_create_event],
-        [And(Txn.on_completion() == OnComplete.NoOp, Txn.application_args[0] == Bytes("verify_ticket")), on_verify],
+    program = router(
+        on_create,
+        on_delete=on_delete,
+        noop_methods={"create_event": on_create_event, "verify_ticket": on_verify},
     )
     
     return program
@@ -285,11 +360,10 @@ def fundraising_approval():
     on_delete = Approve()
     
     # Route calls
-    program = Cond(
-        [Txn.application_id() == Int(0), on_create],
-        [Txn.on_completion() == OnComplete.DeleteApplication, on_delete],
-        [And(Txn.on_completion() == OnComplete.NoOp, Txn.application_args[0] == Bytes("create_campaign")), on_create_campaign],
-        [And(Txn.on_completion() == OnComplete.NoOp, Txn.application_args[0] == Bytes("donate")), on_donate],
+    program = router(
+        on_create,
+        on_delete=on_delete,
+        noop_methods={"create_campaign": on_create_campaign, "donate": on_donate},
     )
     
     return program
@@ -301,11 +375,43 @@ def fundraising_clear():
 
 
 # Compile functions
-def compile_to_teal(program, filename):
-    """Compile PyTeal to TEAL and save to file."""
-    import os
+def compile_to_teal(program_fn, filename):
+    """
+    Compile a PyTeal program builder to TEAL and save to file.
     
-    teal_code = compileTeal(program, mode=Mode.Application, version=8)
+    The TEAL is cached under TEAL_CACHE_DIR, keyed on the builder's source
+    (plus the shared router), the PyTeal version and the compile options, so
+    unchanged programs are not recompiled.
+    """
+    options = (
+        f"{pyteal.__version__}:v{TEAL_VERSION}:"
+        f"{OPTIMIZE_SCRATCH_SLOTS}:{OPTIMIZE_FRAME_POINTERS}:{ASSEMBLE_CONSTANTS}:"
+    )
+    source = inspect.getsource(router) + inspect.getsource(program_fn)
+    cache_key = hashlib.sha256(options.encode() + source.encode()).hexdigest()
+    cache_path = f"{TEAL_CACHE_DIR}/{cache_key}.teal"
+    
+    if os.path.exists(cache_path):
+        with open(cache_path) as f:
+            teal_code = f.read()
+    else:
+        teal_code = compileTeal(
+            program_fn(),
+            mode=Mode.Application,
+            version=TEAL_VERSION,
+            assembleConstants=ASSEMBLE_CONSTANTS,
+            optimize=OptimizeOptions(
+                scratch_slots=OPTIMIZE_SCRATCH_SLOTS,
+                frame_pointers=OPTIMIZE_FRAME_POINTERS,
+            ),
+        )
+        # Write to a temp file and rename so a concurrent or interrupted
+        # run never leaves a truncated entry behind
+        os.makedirs(TEAL_CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=TEAL_CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            f.write(teal_code)
+        os.replace(tmp_path, cache_path)
     
     os.makedirs("build", exist_ok=True)
     filepath = f"build/{filename}"
@@ -317,25 +423,25 @@ def compile_to_teal(program, filename):
     return teal_code
 
 
+# Every program built by this module, as (builder, output file)
+PROGRAMS = (
+    (expense_splitter_approval, "expense_splitter_approval.teal"),
+    (expense_splitter_clear, "expense_splitter_clear.teal"),
+    (dao_treasury_approval, "dao_treasury_approval.teal"),
+    (dao_treasury_clear, "dao_treasury_clear.teal"),
+    (soulbound_ticket_approval, "soulbound_ticket_approval.teal"),
+    (soulbound_ticket_clear, "soulbound_ticket_clear.teal"),
+    (fundraising_approval, "fundraising_approval.teal"),
+    (fundraising_clear, "fundraising_clear.teal"),
+)
+
+
 if __name__ == "__main__":
     print("Compiling Cresca Campus Contracts to TEAL...")
     print("=" * 50)
     
-    # Expense Splitter
-    compile_to_teal(expense_splitter_approval(), "expense_splitter_approval.teal")
-    compile_to_teal(expense_splitter_clear(), "expense_splitter_clear.teal")
-    
-    # DAO Treasury
-    compile_to_teal(dao_treasury_approval(), "dao_treasury_approval.teal")
-    compile_to_teal(dao_treasury_clear(), "dao_treasury_clear.teal")
-    
-    # Soulbound Ticket
-    compile_to_teal(soulbound_ticket_approval(), "soulbound_ticket_approval.teal")
-    compile_to_teal(soulbound_ticket_clear(), "soulbound_ticket_clear.teal")
-    
-    # Fundraising
-    compile_to_teal(fundraising_approval(), "fundraising_approval.teal")
-    compile_to_teal(fundraising_clear(), "fundraising_clear.teal")
+    for program_fn, filename in PROGRAMS:
+        compile_to_teal(program_fn, filename)
     
     print("=" * 50)
     print("All contracts compiled successfully!")
@@ -31,13 +31,26 @@ from algopy import (
     Txn,
     UInt64,
     arc4,
+    gtxn,
     itxn,
     op,
     Box,
+    subroutine,
 )
 from algopy.arc4 import abimethod, Address, String, UInt64 as ARC4UInt64, Bool
 
 
+# Holder record layout, one per ticket serial:
+# holder (32) + issued_at (8) + checked_in_at (8)
+HOLDER_RECORD_SIZE = 48
+OFFSET_HOLDER_CHECKED_IN = 40
+
+# Holder records are paged so each page fits the 1KB a single box
+# reference covers: 21 records (1008 bytes), page = serial // 21
+HOLDERS_PER_PAGE = 21
+HOLDER_PAGE_SIZE = HOLDERS_PER_PAGE * HOLDER_RECORD_SIZE
+
+
 class SoulboundTicket(ARC4Contract):
     """
     ARC-71 Soulbound (Non-Transferable) Event Ticket Contract.
@@ -47,17 +60,27 @@ class SoulboundTicket(ARC4Contract):
     - freeze = this contract (immediately freeze all tickets)
     - clawback = this contract (for revocation)
     
+    Inner transactions are sent with fee=0, so calls to create_event and
+    buy_ticket must pay 2x the minimum fee themselves, and revoke_ticket
+    (clawback + refund) must pay 3x.
+    
+    Ticket calls reference two boxes: the event box and the holder page
+    of the ticket's serial.
+    
     State Schema:
     - Global State:
         - event_count: Number of events created
         
     - Boxes:
         - event_{id}: Event details (name, price, max tickets, sold, asset_id)
-        - ticket_{asset_id}_{holder}: Ticket metadata
+        - h_{id}{page}: Ticket holders, 48-byte records for serials
+          page * 21 to page * 21 + 20 (a zero holder marks a free serial).
+          Created on the page's first sale
     """
     
-    # Global State
-    event_count: GlobalState[UInt64]
+    def __init__(self) -> None:
+        # Global State
+        self.event_count = GlobalState(UInt64)
     
     @arc4.abimethod(create="require")
     def create(self) -> None:
@@ -93,32 +116,33 @@ class SoulboundTicket(ARC4Contract):
         
         # Create the ticket ASA with freeze and clawback set to this contract
         # Unit name is event ID, total is max tickets
+        app_address = Global.current_application_address
         asset_config = itxn.AssetConfig(
             total=max_tickets.native,
             decimals=0,
             unit_name=Bytes(b"TCKT"),
             asset_name=name.native,
-            manager=Global.current_application_address,
-            freeze=Global.current_application_address,  # ARC-71: freeze enabled
-            clawback=Global.current_application_address,  # For revocation
+            manager=app_address,
+            freeze=app_address,  # ARC-71: freeze enabled
+            clawback=app_address,  # For revocation
             default_frozen=True,  # All tickets frozen by default = non-transferable
-            fee=Global.min_txn_fee,
+            fee=0,  # Covered by the outer app call
         )
         result = asset_config.submit()
         asset_id = result.created_asset.id
         
         # Store event details in box
         # Format: asset_id (8) + price (8) + max_tickets (8) + sold (8) + event_date (8) + creator (32)
+        # The box is created zeroed, which already encodes sold = 0; the two
+        # contiguous runs either side of it are written directly
         event_key = Bytes(b"event_") + op.itob(event_id)
-        event_data = (
-            op.itob(asset_id) +
-            op.itob(price.native) +
-            op.itob(max_tickets.native) +
-            op.itob(UInt64(0)) +  # sold count
-            op.itob(event_date.native) +
-            Txn.sender.bytes
+        op.Box.create(event_key, 72)
+        op.Box.replace(
+            event_key,
+            0,
+            op.itob(asset_id) + op.itob(price.native) + op.itob(max_tickets.native),
         )
-        op.Box.put(event_key, event_data)
+        op.Box.replace(event_key, 32, op.itob(event_date.native) + Txn.sender.bytes)
         
         return arc4.UInt64(event_id)
     
@@ -127,24 +151,27 @@ class SoulboundTicket(ARC4Contract):
         self,
         event_id: arc4.UInt64,
         payment_txn_index: arc4.UInt64,
+        ticket_serial: arc4.UInt64,
     ) -> arc4.UInt64:
         """
         Purchase a soulbound ticket for an event.
-        Must include a payment transaction in the same group.
+        Must be preceded in the group by the buyer's payment of the
+        ticket price to the app account.
         
         The ticket ASA is transferred to the buyer and immediately frozen,
         making it non-transferable (ARC-71 soulbound).
         
         Args:
             event_id: ID of the event
-            payment_txn_index: Index of payment txn in group
+            payment_txn_index: Index of payment txn in group (this call's index - 1)
+            ticket_serial: Free holder slot to issue (normally the sold count)
             
         Returns:
             The ticket ASA ID
         """
         # Get event details
         event_key = Bytes(b"event_") + op.itob(event_id.native)
-        event_exists, event_data = op.Box.get(event_key)
+        event_data, event_exists = op.Box.get(event_key)
         assert event_exists, "Event does not exist"
         
         asset_id = op.btoi(op.extract(event_data, 0, 8))
@@ -155,8 +182,19 @@ class SoulboundTicket(ARC4Contract):
         # Check tickets available
         assert sold < max_tickets, "Event sold out"
         
-        # Verify payment (caller must have sent payment in group)
-        # In production, verify the payment txn at the specified index
+        assert ticket_serial.native < max_tickets, "Invalid ticket serial"
+        holders_key, record_offset = self._holder_record(event_id.native, ticket_serial.native)
+        # No-op if the page already exists
+        op.Box.create(holders_key, HOLDER_PAGE_SIZE)
+        assert op.Box.extract(holders_key, record_offset, 32) == Global.zero_address.bytes, "Ticket serial taken"
+        
+        # Collect the price, which revoke_ticket refunds. The payment must
+        # sit right before this call so one payment can't buy two tickets
+        assert payment_txn_index.native + UInt64(1) == Txn.group_index, "Payment must precede the call"
+        payment = gtxn.PaymentTransaction(payment_txn_index.native)
+        assert payment.sender == Txn.sender, "Payment must come from the buyer"
+        assert payment.receiver == Global.current_application_address, "Payment must go to the app"
+        assert payment.amount == price, "Payment must equal the ticket price"
         
         # Mint ticket to buyer (transfer from contract's holdings)
         # The ticket is already frozen by default
@@ -164,22 +202,14 @@ class SoulboundTicket(ARC4Contract):
             xfer_asset=Asset(asset_id),
             asset_receiver=Txn.sender,
             asset_amount=1,
-            fee=Global.min_txn_fee,
+            fee=0,  # Covered by the outer app call
         ).submit()
         
-        # Update sold count
-        new_sold = sold + UInt64(1)
-        updated_event = (
-            op.extract(event_data, 0, 24) +  # asset_id + price + max_tickets
-            op.itob(new_sold) +               # updated sold count
-            op.extract(event_data, 32, 40)    # event_date + creator
-        )
-        op.Box.put(event_key, updated_event)
+        # Update sold count in place
+        op.Box.replace(event_key, 24, op.itob(sold + UInt64(1)))
         
-        # Store ticket ownership for verification
-        ticket_key = Bytes(b"ticket_") + op.itob(asset_id) + Txn.sender.bytes
-        ticket_data = op.itob(event_id.native) + op.itob(Global.latest_timestamp)
-        op.Box.put(ticket_key, ticket_data)
+        # Record ticket ownership for verification (checked_in_at stays 0)
+        op.Box.replace(holders_key, record_offset, Txn.sender.bytes + op.itob(Global.latest_timestamp))
         
         return arc4.UInt64(asset_id)
     
@@ -188,33 +218,49 @@ class SoulboundTicket(ARC4Contract):
         self,
         holder: arc4.Address,
         event_id: arc4.UInt64,
+        ticket_serial: arc4.UInt64,
     ) -> arc4.Bool:
         """
         Verify that a wallet holds a valid ticket for an event.
         Used for QR scan verification at event gate.
         
+        Tickets are frozen and revocation clears the holder record, so the
+        record alone is authoritative and no asset lookup is needed.
+        
         Args:
             holder: Address claiming to hold the ticket
             event_id: ID of the event
+            ticket_serial: Serial of the ticket being presented
             
         Returns:
             True if holder has a valid ticket
         """
-        # Get event details
-        event_key = Bytes(b"event_") + op.itob(event_id.native)
-        event_exists, event_data = op.Box.get(event_key)
+        return arc4.Bool(self._holds_ticket(holder.bytes, event_id.native, ticket_serial.native))
+    
+    @arc4.abimethod
+    def verify_ticket_strict(
+        self,
+        holder: arc4.Address,
+        event_id: arc4.UInt64,
+        ticket_serial: arc4.UInt64,
+    ) -> arc4.Bool:
+        """
+        Verify a ticket and also check the holder's ticket ASA balance.
+        Needs the holder account and ticket asset in the call's references.
         
-        if not event_exists:
+        Args:
+            holder: Address claiming to hold the ticket
+            event_id: ID of the event
+            ticket_serial: Serial of the ticket being presented
+            
+        Returns:
+            True if holder has a valid ticket and still holds the asset
+        """
+        if not self._holds_ticket(holder.bytes, event_id.native, ticket_serial.native):
             return arc4.Bool(False)
         
-        asset_id = op.btoi(op.extract(event_data, 0, 8))
-        
-        # Check ticket ownership box
-        ticket_key = Bytes(b"ticket_") + op.itob(asset_id) + holder.bytes
-        ticket_exists, _ = op.Box.get(ticket_key)
-        
-        if not ticket_exists:
-            return arc4.Bool(False)
+        event_key = Bytes(b"event_") + op.itob(event_id.native)
+        asset_id = op.btoi(op.Box.extract(event_key, 0, 8))
         
         # Verify holder still has the asset (on-chain balance check)
         holder_account = Account(holder.bytes)
@@ -229,6 +275,7 @@ class SoulboundTicket(ARC4Contract):
     def check_in(
         self,
         event_id: arc4.UInt64,
+        ticket_serial: arc4.UInt64,
     ) -> None:
         """
         Check in to an event (mark ticket as used).
@@ -236,72 +283,83 @@ class SoulboundTicket(ARC4Contract):
         
         Args:
             event_id: ID of the event
+            ticket_serial: Serial of the caller's ticket
         """
-        # Get event details
         event_key = Bytes(b"event_") + op.itob(event_id.native)
-        event_exists, event_data = op.Box.get(event_key)
+        _, event_exists = op.Box.length(event_key)
         assert event_exists, "Event does not exist"
         
-        asset_id = op.btoi(op.extract(event_data, 0, 8))
-        
         # Verify caller has ticket
-        ticket_key = Bytes(b"ticket_") + op.itob(asset_id) + Txn.sender.bytes
-        ticket_exists, ticket_data = op.Box.get(ticket_key)
-        assert ticket_exists, "No ticket found"
-        
-        # Update ticket with check-in timestamp
-        updated_ticket = ticket_data + op.itob(Global.latest_timestamp)
-        op.Box.put(ticket_key, updated_ticket)
+        max_tickets = op.btoi(op.Box.extract(event_key, 16, 8))
+        assert ticket_serial.native < max_tickets, "Invalid ticket serial"
+        assert self._holds_ticket(Txn.sender.bytes, event_id.native, ticket_serial.native), "No ticket found"
+        holders_key, record_offset = self._holder_record(event_id.native, ticket_serial.native)
+        
+        # Record check-in timestamp on the ticket
+        op.Box.replace(
+            holders_key,
+            record_offset + UInt64(OFFSET_HOLDER_CHECKED_IN),
+            op.itob(Global.latest_timestamp),
+        )
     
     @arc4.abimethod
     def revoke_ticket(
         self,
         holder: arc4.Address,
         event_id: arc4.UInt64,
+        ticket_serial: arc4.UInt64,
     ) -> None:
         """
-        Revoke a ticket (clawback to contract).
+        Revoke a ticket (clawback to contract) and refund its price.
         Only event creator can revoke tickets.
-        Used for refunds or banning.
+        
+        The clawback and the refund payment are submitted as one inner
+        group, so the holder never loses the ticket without the refund.
         
         Args:
             holder: Address of ticket holder
             event_id: ID of the event
+            ticket_serial: Serial of the holder's ticket
         """
         # Get event details
         event_key = Bytes(b"event_") + op.itob(event_id.native)
-        event_exists, event_data = op.Box.get(event_key)
+        _, event_exists = op.Box.length(event_key)
         assert event_exists, "Event does not exist"
         
         # Verify caller is event creator
-        creator = op.extract(event_data, 40, 32)
+        creator = op.Box.extract(event_key, 40, 32)
         assert Txn.sender.bytes == creator, "Only creator can revoke"
         
-        asset_id = op.btoi(op.extract(event_data, 0, 8))
+        max_tickets = op.btoi(op.Box.extract(event_key, 16, 8))
+        assert ticket_serial.native < max_tickets, "Invalid ticket serial"
+        assert self._holds_ticket(holder.bytes, event_id.native, ticket_serial.native), "No ticket found"
+        holders_key, record_offset = self._holder_record(event_id.native, ticket_serial.native)
+        
+        asset_id = op.btoi(op.Box.extract(event_key, 0, 8))
+        price = op.btoi(op.Box.extract(event_key, 8, 8))
         holder_account = Account(holder.bytes)
         
-        # Clawback the ticket
-        itxn.AssetTransfer(
+        # Clawback the ticket and refund the holder atomically
+        clawback = itxn.AssetTransfer(
             xfer_asset=Asset(asset_id),
             asset_sender=holder_account,  # Clawback from
             asset_receiver=Global.current_application_address,  # Back to contract
             asset_amount=1,
-            fee=Global.min_txn_fee,
-        ).submit()
+            fee=0,  # Covered by the outer app call
+        )
+        refund = itxn.Payment(
+            receiver=holder_account,
+            amount=price,
+            fee=0,  # Covered by the outer app call
+        )
+        itxn.submit_txns(clawback, refund)
         
-        # Delete ticket record
-        ticket_key = Bytes(b"ticket_") + op.itob(asset_id) + holder.bytes
-        op.Box.delete(ticket_key)
+        # Clear the holder record, freeing the serial for resale
+        op.Box.replace(holders_key, record_offset, op.bzero(HOLDER_RECORD_SIZE))
         
-        # Decrement sold count (ticket available again)
-        sold = op.btoi(op.extract(event_data, 24, 8))
-        new_sold = sold - UInt64(1)
-        updated_event = (
-            op.extract(event_data, 0, 24) +
-            op.itob(new_sold) +
-            op.extract(event_data, 32, 40)
-        )
-        op.Box.put(event_key, updated_event)
+        # Decrement sold count in place (ticket available again)
+        sold = op.btoi(op.Box.extract(event_key, 24, 8))
+        op.Box.replace(event_key, 24, op.itob(sold - UInt64(1)))
     
     @arc4.abimethod
     def get_event(
@@ -318,7 +376,7 @@ class SoulboundTicket(ARC4Contract):
             Tuple of (asset_id, price, max_tickets, sold, event_date, creator)
         """
         event_key = Bytes(b"event_") + op.itob(event_id.native)
-        event_exists, event_data = op.Box.get(event_key)
+        event_data, event_exists = op.Box.get(event_key)
         assert event_exists, "Event does not exist"
         
         return arc4.Tuple((
@@ -340,6 +398,28 @@ class SoulboundTicket(ARC4Contract):
         """
         return arc4.UInt64(self.event_count.value)
     
+    @subroutine
+    def _holder_record(self, event_id: UInt64, ticket_serial: UInt64) -> tuple[Bytes, UInt64]:
+        """Key of the holder page containing a serial, and the record's offset in it."""
+        page = ticket_serial // UInt64(HOLDERS_PER_PAGE)
+        record_offset = (ticket_serial % UInt64(HOLDERS_PER_PAGE)) * UInt64(HOLDER_RECORD_SIZE)
+        return Bytes(b"h_") + op.itob(event_id) + op.itob(page), record_offset
+    
+    @subroutine
+    def _holds_ticket(self, holder: Bytes, event_id: UInt64, ticket_serial: UInt64) -> bool:
+        """Whether the holder record for this serial belongs to holder."""
+        # Free slots hold the zero address, so it never holds a ticket
+        if holder == Global.zero_address.bytes:
+            return False
+        
+        holders_key, record_offset = self._holder_record(event_id, ticket_serial)
+        _, page_exists = op.Box.length(holders_key)
+        
+        if not page_exists:
+            return False
+        
+        return op.Box.extract(holders_key, record_offset, 32) == holder
+    
     @arc4.abimethod(allow_actions=["DeleteApplication"])
     def delete(self) -> None:
         """
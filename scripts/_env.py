@@ -0,0 +1,26 @@
+"""
+Shared .env loading for the deployment scripts.
+
+The .env file is located and parsed once per process, the first time a
+variable is read; every later read goes straight to os.environ.
+
+Usage:
+    from _env import getenv
+    server = getenv("ALGOD_SERVER", "http://localhost:4001")
+"""
+
+import os
+from functools import lru_cache
+from dotenv import load_dotenv
+
+
+@lru_cache(maxsize=1)
+def load_env() -> None:
+    """Load environment variables from .env, once per process."""
+    load_dotenv()
+
+
+def getenv(name: str, default=None):
+    """Read an environment variable, loading .env on first use."""
+    load_env()
+    return os.getenv(name, default)
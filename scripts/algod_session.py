@@ -0,0 +1,148 @@
+"""
+Keep-alive Algod/KMD clients for the deployment scripts.
+
+py-algorand-sdk opens a new HTTPS connection (and TLS handshake) for every
+RPC. These subclasses route requests through one shared requests.Session,
+so deploy/test runs reuse pooled connections to the node.
+
+Usage:
+    from algod_session import SessionAlgodClient, get_suggested_params, wait_for_confirmation_fast
+    client = SessionAlgodClient(token, address)
+    params = get_suggested_params(client)
+    wait_for_confirmation_fast(client, tx_id)
+"""
+
+import json
+import sys
+from pathlib import Path
+from urllib.parse import urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+from algosdk import constants, error, transaction
+from algosdk.v2client import algod
+from algosdk import kmd
+
+# Scripts run with scripts/ as the import root; the params cache lives
+# with the P2P helpers under contracts/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from contracts.p2p_payment.contract import SuggestedParamsCache
+
+
+def _make_session() -> requests.Session:
+    """Create a session with a small connection pool for each scheme."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Shared by every client created in this process
+SESSION = _make_session()
+
+# Suggested params cache per node address
+_params_caches = {}
+
+
+class SessionAlgodClient(algod.AlgodClient):
+    """AlgodClient that sends every request over the shared session."""
+
+    def algod_request(
+        self,
+        method,
+        requested,
+        params=None,
+        data=None,
+        headers=None,
+        response_format="json",
+        timeout=30,
+    ):
+        header = {"User-Agent": "py-algorand-sdk"}
+        if self.headers:
+            header.update(self.headers)
+        if headers:
+            header.update(headers)
+        if self.algod_token:
+            header[constants.algod_auth_header] = self.algod_token
+
+        url = self.algod_address + requested
+        if params:
+            url += "?" + urlencode(params)
+
+        resp = SESSION.request(method, url, headers=header, data=data, timeout=timeout)
+        if not resp.ok:
+            try:
+                message = resp.json()["message"]
+            except Exception:
+                message = resp.text
+            raise error.AlgodHTTPError(message, resp.status_code)
+
+        if response_format == "json":
+            try:
+                return resp.json()
+            except Exception as e:
+                raise error.AlgodResponseError("Failed to parse JSON response from algod") from e
+        return resp.content
+
+
+class SessionKMDClient(kmd.KMDClient):
+    """KMDClient that sends every request over the shared session."""
+
+    def kmd_request(self, method, requested, params=None, data=None, timeout=30):
+        header = {"User-Agent": "py-algorand-sdk"}
+        if self.kmd_token:
+            header[constants.kmd_auth_header] = self.kmd_token
+
+        if not requested.startswith("/"):
+            requested = "/" + requested
+        url = self.kmd_address + requested
+        if params:
+            url += "?" + urlencode(params)
+        if data:
+            data = json.dumps(data, indent=2).encode()
+
+        resp = SESSION.request(method, url, headers=header, data=data, timeout=timeout)
+        if not resp.ok:
+            try:
+                message = resp.json()["message"]
+            except Exception:
+                message = resp.text
+            raise error.KMDHTTPError(message)
+        return resp.json()
+
+
+def wait_for_confirmation_fast(client: algod.AlgodClient, tx_id: str, wait_rounds: int = 4) -> dict:
+    """
+    Wait for a transaction to confirm using algod's status-after-block
+    long-poll, so each round costs one blocking request instead of a
+    status polling loop.
+    """
+    pending = client.pending_transaction_info(tx_id)
+    last_round = client.status()["last-round"]
+    end_round = last_round + wait_rounds
+    
+    while not pending.get("confirmed-round"):
+        if pending.get("pool-error"):
+            raise Exception(f"Transaction rejected: {pending['pool-error']}")
+        if last_round >= end_round:
+            raise Exception(f"Transaction {tx_id} not confirmed after {wait_rounds} rounds")
+        
+        last_round = client.status_after_block(last_round)["last-round"]
+        pending = client.pending_transaction_info(tx_id)
+    
+    return pending
+
+
+def get_suggested_params(client: algod.AlgodClient) -> transaction.SuggestedParams:
+    """
+    Get suggested params from the process-wide SuggestedParamsCache for
+    the client's node, so repeated calls in a run share one fetch.
+    
+    Returns:
+        A copy of the cached params, safe for the caller to mutate
+    """
+    cache = _params_caches.get(client.algod_address)
+    if cache is None:
+        cache = _params_caches[client.algod_address] = SuggestedParamsCache(client)
+    return cache.get()
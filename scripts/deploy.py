@@ -11,29 +11,31 @@ Environment variables required:
 - NETWORK: localnet | testnet | mainnet
 """
 
-import os
 import json
+import base64
+from functools import lru_cache
 from pathlib import Path
-from dotenv import load_dotenv
 from algosdk import account, mnemonic
 from algosdk.v2client import algod
 from algosdk import transaction
 
-# Load environment variables
-load_dotenv()
+from _env import getenv
+from algod_session import get_suggested_params, wait_for_confirmation_fast
 
 
+@lru_cache(maxsize=1)
 def get_algod_client() -> algod.AlgodClient:
     """Create Algorand client from environment variables."""
-    server = os.getenv("ALGOD_SERVER", "http://localhost:4001")
-    token = os.getenv("ALGOD_TOKEN", "a" * 64)
+    server = getenv("ALGOD_SERVER", "http://localhost:4001")
+    token = getenv("ALGOD_TOKEN", "a" * 64)
     
     return algod.AlgodClient(token, server)
 
 
+@lru_cache(maxsize=1)
 def get_deployer_account() -> tuple[str, str]:
-    """Get deployer account from mnemonic."""
-    mnemonic_phrase = os.getenv("DEPLOYER_MNEMONIC")
+    """Get deployer account from mnemonic (derived once per process)."""
+    mnemonic_phrase = getenv("DEPLOYER_MNEMONIC")
     
     if not mnemonic_phrase:
         # For localnet, use default account
@@ -48,9 +50,14 @@ def get_deployer_account() -> tuple[str, str]:
 
 
 def compile_contract(client: algod.AlgodClient, source_code: str) -> bytes:
-    """Compile TEAL source code."""
+    """
+    Compile TEAL source code.
+    
+    algod returns the program base64-encoded; it is decoded once here and
+    the raw bytes go straight into the msgpack-encoded transaction.
+    """
     compile_response = client.compile(source_code)
-    return bytes.fromhex(compile_response["result"])
+    return base64.b64decode(compile_response["result"])
 
 
 def deploy_contract(
@@ -64,7 +71,7 @@ def deploy_contract(
     app_args: list = None,
 ) -> int:
     """Deploy a smart contract and return the app ID."""
-    params = client.suggested_params()
+    params = get_suggested_params(client)
     
     txn = transaction.ApplicationCreateTxn(
         sender=sender,
@@ -81,7 +88,7 @@ def deploy_contract(
     tx_id = client.send_transaction(signed_txn)
     
     # Wait for confirmation
-    result = transaction.wait_for_confirmation(client, tx_id, 4)
+    result = wait_for_confirmation_fast(client, tx_id)
     app_id = result["application-index"]
     
     return app_id
@@ -94,7 +101,7 @@ def main():
     print("=" * 60)
     
     # Get network info
-    network = os.getenv("NETWORK", "localnet")
+    network = getenv("NETWORK", "localnet")
     print(f"\nNetwork: {network}")
     
     # Initialize client
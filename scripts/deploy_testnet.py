@@ -7,12 +7,20 @@ This script deploys all compiled TEAL contracts to testnet.
 import os
 import json
 import base64
+import hashlib
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from dotenv import load_dotenv
 from algosdk import account, mnemonic, transaction
-from algosdk.v2client import algod
 
-load_dotenv()
+try:
+    import orjson
+except ImportError:  # optional: faster JSON encoding
+    orjson = None
+
+from _env import getenv
+from algod_session import SessionAlgodClient, get_suggested_params, wait_for_confirmation_fast
 
 # Testnet configuration - use a node that supports compilation
 ALGOD_ADDRESS = "https://testnet-api.algonode.cloud"
@@ -22,16 +30,20 @@ ALGOD_TOKEN = ""
 COMPILE_ADDRESS = "https://testnet-api.algonode.cloud"
 
 # Deployer account
-DEPLOYER_MNEMONIC = os.getenv("DEPLOYER_MNEMONIC")
+DEPLOYER_MNEMONIC = getenv("DEPLOYER_MNEMONIC")
+
+# Compiled bytecode cache, keyed on the genesis hash and TEAL source hash
+COMPILE_CACHE_DIR = Path("build/.teal_cache")
 
 
 def get_client():
     """Get Algorand client for testnet."""
-    return algod.AlgodClient(ALGOD_TOKEN, ALGOD_ADDRESS)
+    return SessionAlgodClient(ALGOD_TOKEN, ALGOD_ADDRESS)
 
 
+@lru_cache(maxsize=1)
 def get_deployer():
-    """Get deployer account from environment."""
+    """Get deployer account from environment (derived once per process)."""
     if not DEPLOYER_MNEMONIC:
         raise ValueError("DEPLOYER_MNEMONIC not set in environment")
     
@@ -40,59 +52,139 @@ def get_deployer():
     return private_key, address
 
 
-def compile_teal(client, source):
-    """Compile TEAL source code using the Algorand node."""
+def compile_teal(client, source, genesis_hash=""):
+    """
+    Compile TEAL source code using the Algorand node.
+    
+    Bytecode is cached on disk so unchanged programs skip the /compile call.
+    The network's genesis hash is part of the key, so testnet and mainnet
+    builds never share entries.
+    """
+    key = hashlib.sha256((genesis_hash + source).encode()).hexdigest()
+    cache_path = COMPILE_CACHE_DIR / f"{key}.tok"
+    if cache_path.exists():
+        return cache_path.read_bytes()
+    
     try:
         response = client.compile(source)
-        return base64.b64decode(response["result"])
+        program = base64.b64decode(response["result"])
     except Exception as e:
         print(f"      Compilation error: {e}")
         raise
+    
+    # Write to a temp file and rename so a concurrent or interrupted
+    # run never leaves a truncated entry behind
+    COMPILE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=COMPILE_CACHE_DIR, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(program)
+    os.replace(tmp_path, cache_path)
+    return program
 
 
-def deploy_contract(client, private_key, sender, approval_file, clear_file, global_ints, global_bytes, local_ints, local_bytes, app_args=None):
-    """Deploy a smart contract."""
+def compile_all(client, teal_files):
+    """
+    Compile TEAL files concurrently; returns {path: bytecode}.
     
-    # Read TEAL files
-    with open(approval_file) as f:
-        approval_source = f.read()
-    with open(clear_file) as f:
-        clear_source = f.read()
+    Identical sources (every contract's clear program is a bare approve)
+    are compiled once and shared between their paths.
+    """
+    with ThreadPoolExecutor(max_workers=len(teal_files)) as executor:
+        sources = list(executor.map(lambda path: Path(path).read_text(), teal_files))
+    unique_sources = list(dict.fromkeys(sources))
+    genesis_hash = get_suggested_params(client).gh
     
-    # Compile
-    approval_program = compile_teal(client, approval_source)
-    clear_program = compile_teal(client, clear_source)
+    with ThreadPoolExecutor(max_workers=len(unique_sources)) as executor:
+        programs = executor.map(lambda source: compile_teal(client, source, genesis_hash), unique_sources)
+        by_source = dict(zip(unique_sources, programs))
+    return {path: by_source[source] for path, source in zip(teal_files, sources)}
+
+
+def write_json(path, data):
+    """Write data as indented JSON, using orjson when it is installed."""
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+
+
+def teal_files_for(contracts):
+    """List the approval and clear TEAL paths of the given contract specs."""
+    return [path for c in contracts for path in (c["approval"], c["clear"])]
+
+
+def deploy_contracts(client, private_key, sender, contracts, atomic=True, programs=None):
+    """
+    Deploy several smart contracts in a single round.
     
-    # Create schemas
-    global_schema = transaction.StateSchema(global_ints, global_bytes)
-    local_schema = transaction.StateSchema(local_ints, local_bytes)
+    Args:
+        contracts: Specs with name, approval/clear TEAL paths, state schema
+            sizes and optional app_args
+        atomic: Send the creates as one atomic group. When False they are
+            broadcast back-to-back as independent transactions, so one
+            rejected contract does not stop the others.
+        programs: Bytecode from compile_all, if it was compiled up front
+    
+    Returns:
+        {name: (app_id, tx_id)} for every contract that was created
+    """
+    if programs is None:
+        programs = compile_all(client, teal_files_for(contracts))
     
     # Get suggested params
-    params = client.suggested_params()
-    
-    # Create transaction
-    txn = transaction.ApplicationCreateTxn(
-        sender=sender,
-        sp=params,
-        on_complete=transaction.OnComplete.NoOpOC,
-        approval_program=approval_program,
-        clear_program=clear_program,
-        global_schema=global_schema,
-        local_schema=local_schema,
-        app_args=app_args,
-    )
+    params = get_suggested_params(client)
     
-    # Sign and send
-    signed_txn = txn.sign(private_key)
-    tx_id = client.send_transaction(signed_txn)
+    txns = [
+        transaction.ApplicationCreateTxn(
+            sender=sender,
+            sp=params,
+            on_complete=transaction.OnComplete.NoOpOC,
+            approval_program=programs[c["approval"]],
+            clear_program=programs[c["clear"]],
+            global_schema=transaction.StateSchema(c["global_ints"], c["global_bytes"]),
+            local_schema=transaction.StateSchema(c["local_ints"], c["local_bytes"]),
+            app_args=c.get("app_args"),
+        )
+        for c in contracts
+    ]
+    if atomic:
+        transaction.assign_group_id(txns)
     
-    print(f"   Transaction ID: {tx_id}")
+    # Sign and send
+    signed_txns = [txn.sign(private_key) for txn in txns]
+    tx_ids = [txn.get_txid() for txn in txns]
+    if atomic:
+        client.send_transactions(signed_txns)
+        print(f"   Group of {len(txns)} sent, first transaction ID: {tx_ids[0]}")
+    else:
+        sent = []
+        for contract, stxn, tx_id in zip(contracts, signed_txns, tx_ids):
+            try:
+                client.send_transaction(stxn)
+                sent.append(tx_id)
+            except Exception as e:
+                print(f"   ❌ {contract['name']} rejected: {e}")
+        print(f"   {len(sent)} of {len(txns)} transactions sent")
+        if not sent:
+            return {}
+        tx_ids = [tx_id if tx_id in sent else None for tx_id in tx_ids]
     
-    # Wait for confirmation
-    result = transaction.wait_for_confirmation(client, tx_id, 4)
-    app_id = result["application-index"]
+    # Independent transactions can confirm in different rounds, so each one
+    # is waited on; once the first confirms the rest usually return at once
+    deployed = {}
+    for contract, tx_id in zip(contracts, tx_ids):
+        if tx_id is None:
+            continue
+        try:
+            result = wait_for_confirmation_fast(client, tx_id)
+        except Exception as e:
+            print(f"   ❌ {contract['name']} failed: {e}")
+            continue
+        deployed[contract["name"]] = (result["application-index"], tx_id)
     
-    return app_id, tx_id
+    return deployed
 
 
 def main():
@@ -100,88 +192,85 @@ def main():
     print("🏫 CRESCA CAMPUS - TESTNET DEPLOYMENT")
     print("=" * 60)
     
-    # Initialize
     client = get_client()
-    private_key, deployer = get_deployer()
-    
-    print(f"\n📍 Network: Algorand Testnet")
-    print(f"📍 Deployer: {deployer}")
     
-    # Check balance
-    info = client.account_info(deployer)
-    balance = info["amount"] / 1_000_000
-    print(f"💰 Balance: {balance} ALGO")
+    contracts = [
+        {
+            "name": "expense_splitter",
+            "label": "1️⃣ Expense Splitter",
+            "approval": "build/expense_splitter_approval.teal",
+            "clear": "build/expense_splitter_clear.teal",
+            "global_ints": 0, "global_bytes": 1,  # Packed state: counters + creator in one value
+            "local_ints": 3, "local_bytes": 0,
+        },
+        {
+            "name": "dao_treasury",
+            "label": "2️⃣ DAO Treasury",
+            "approval": "build/dao_treasury_approval.teal",
+            "clear": "build/dao_treasury_clear.teal",
+            "global_ints": 4, "global_bytes": 1,
+            "local_ints": 1, "local_bytes": 0,
+            "app_args": [2],  # Threshold = 2
+        },
+        {
+            "name": "soulbound_ticket",
+            "label": "3️⃣ Soulbound Ticket (ARC-71)",
+            "approval": "build/soulbound_ticket_approval.teal",
+            "clear": "build/soulbound_ticket_clear.teal",
+            "global_ints": 1, "global_bytes": 0,
+            "local_ints": 0, "local_bytes": 0,
+        },
+        {
+            "name": "fundraising",
+            "label": "4️⃣ Fundraising Escrow",
+            "approval": "build/fundraising_approval.teal",
+            "clear": "build/fundraising_clear.teal",
+            "global_ints": 1, "global_bytes": 0,
+            "local_ints": 0, "local_bytes": 0,
+        },
+    ]
     
-    if balance < 1:
-        print("❌ Insufficient balance! Need at least 1 ALGO")
-        return
-    
-    print("\n" + "-" * 60)
-    print("📄 DEPLOYING CONTRACTS")
-    print("-" * 60)
+    # Compile while the mnemonic is decoded and the balance checked
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        programs_future = executor.submit(compile_all, client, teal_files_for(contracts))
+        private_key, deployer = get_deployer()
+        
+        print(f"\n📍 Network: Algorand Testnet")
+        print(f"📍 Deployer: {deployer}")
+        
+        # Check balance
+        info = client.account_info(deployer)
+        balance = info["amount"] / 1_000_000
+        print(f"💰 Balance: {balance} ALGO")
+        
+        if balance < 1:
+            print("❌ Insufficient balance! Need at least 1 ALGO")
+            return
+        
+        print("\n" + "-" * 60)
+        print("📄 DEPLOYING CONTRACTS")
+        print("-" * 60)
+        
+        try:
+            programs = programs_future.result()
+        except Exception as e:
+            print(f"   ❌ Compilation failed: {e}")
+            return
     
     deployed = {}
     
-    # 1. Expense Splitter
-    print("\n1️⃣ Expense Splitter")
-    try:
-        app_id, tx_id = deploy_contract(
-            client, private_key, deployer,
-            "build/expense_splitter_approval.teal",
-            "build/expense_splitter_clear.teal",
-            global_ints=5, global_bytes=1,  # Changed: need 1 bytes for creator address
-            local_ints=3, local_bytes=0,
-        )
-        deployed["expense_splitter"] = {"app_id": app_id, "tx_id": tx_id}
-        print(f"   ✅ Deployed! App ID: {app_id}")
-    except Exception as e:
-        print(f"   ❌ Failed: {e}")
-    
-    # 2. DAO Treasury
-    print("\n2️⃣ DAO Treasury")
-    try:
-        app_id, tx_id = deploy_contract(
-            client, private_key, deployer,
-            "build/dao_treasury_approval.teal",
-            "build/dao_treasury_clear.teal",
-            global_ints=4, global_bytes=1,
-            local_ints=1, local_bytes=0,
-            app_args=[2],  # Threshold = 2
-        )
-        deployed["dao_treasury"] = {"app_id": app_id, "tx_id": tx_id}
-        print(f"   ✅ Deployed! App ID: {app_id}")
-    except Exception as e:
-        print(f"   ❌ Failed: {e}")
-    
-    # 3. Soulbound Ticket
-    print("\n3️⃣ Soulbound Ticket (ARC-71)")
     try:
-        app_id, tx_id = deploy_contract(
-            client, private_key, deployer,
-            "build/soulbound_ticket_approval.teal",
-            "build/soulbound_ticket_clear.teal",
-            global_ints=1, global_bytes=0,
-            local_ints=0, local_bytes=0,
-        )
-        deployed["soulbound_ticket"] = {"app_id": app_id, "tx_id": tx_id}
-        print(f"   ✅ Deployed! App ID: {app_id}")
+        results = deploy_contracts(client, private_key, deployer, contracts, atomic=False, programs=programs)
     except Exception as e:
         print(f"   ❌ Failed: {e}")
+        results = {}
     
-    # 4. Fundraising Escrow
-    print("\n4️⃣ Fundraising Escrow")
-    try:
-        app_id, tx_id = deploy_contract(
-            client, private_key, deployer,
-            "build/fundraising_approval.teal",
-            "build/fundraising_clear.teal",
-            global_ints=1, global_bytes=0,
-            local_ints=0, local_bytes=0,
-        )
-        deployed["fundraising"] = {"app_id": app_id, "tx_id": tx_id}
-        print(f"   ✅ Deployed! App ID: {app_id}")
-    except Exception as e:
-        print(f"   ❌ Failed: {e}")
+    for contract in contracts:
+        if contract["name"] in results:
+            app_id, tx_id = results[contract["name"]]
+            deployed[contract["name"]] = {"app_id": app_id, "tx_id": tx_id}
+            print(f"\n{contract['label']}")
+            print(f"   ✅ Deployed! App ID: {app_id}")
     
     # Summary
     print("\n" + "=" * 60)
@@ -200,8 +289,7 @@ def main():
         "contracts": deployed,
     }
     
-    with open("deployment_testnet.json", "w") as f:
-        json.dump(deployment_info, f, indent=2)
+    write_json("deployment_testnet.json", deployment_info)
     
     print(f"\n💾 Deployment info saved to: deployment_testnet.json")
     
@@ -10,20 +10,19 @@ Usage:
 This will fund the sponsor wallet with 10 ALGO for fee sponsorship.
 """
 
-import os
-import argparse
-from dotenv import load_dotenv
+import time
 from algosdk import account, mnemonic, transaction
 from algosdk.v2client import algod
 
-load_dotenv()
+from _env import getenv
+from algod_session import SessionAlgodClient, wait_for_confirmation_fast
 
 
 def get_algod_client() -> algod.AlgodClient:
     """Create Algorand client from environment variables."""
-    server = os.getenv("ALGOD_SERVER", "http://localhost:4001")
-    token = os.getenv("ALGOD_TOKEN", "a" * 64)
-    return algod.AlgodClient(token, server)
+    server = getenv("ALGOD_SERVER", "http://localhost:4001")
+    token = getenv("ALGOD_TOKEN", "a" * 64)
+    return SessionAlgodClient(token, server)
 
 
 def create_or_load_sponsor() -> tuple[str, str]:
@@ -33,7 +32,7 @@ def create_or_load_sponsor() -> tuple[str, str]:
     Returns:
         Tuple of (private_key, address)
     """
-    sponsor_mnemonic = os.getenv("SPONSOR_MNEMONIC")
+    sponsor_mnemonic = getenv("SPONSOR_MNEMONIC")
     
     if sponsor_mnemonic:
         private_key = mnemonic.to_private_key(sponsor_mnemonic)
@@ -54,7 +53,8 @@ def fund_sponsor(
     funder_key: str,
     funder_address: str,
     sponsor_address: str,
-    amount_algo: float
+    amount_algo: float,
+    wait: bool = True,
 ):
     """
     Fund the sponsor wallet with ALGO.
@@ -65,6 +65,9 @@ def fund_sponsor(
         funder_address: Address of funder
         sponsor_address: Address of sponsor to fund
         amount_algo: Amount in ALGO to send
+        wait: Wait for confirmation. When False the transaction ID is
+            returned as soon as it is sent; pair it with
+            check_sponsor_balance(min_amount=...) to see the funds land.
     """
     amount_microalgo = int(amount_algo * 1_000_000)
     
@@ -81,7 +84,12 @@ def fund_sponsor(
     signed_txn = txn.sign(funder_key)
     tx_id = client.send_transaction(signed_txn)
     
-    result = transaction.wait_for_confirmation(client, tx_id, 4)
+    if not wait:
+        print(f"📤 Sent {amount_algo} ALGO to sponsor")
+        print(f"   Transaction ID: {tx_id}")
+        return tx_id
+    
+    wait_for_confirmation_fast(client, tx_id)
     
     print(f"✅ Funded sponsor with {amount_algo} ALGO")
     print(f"   Transaction ID: {tx_id}")
@@ -89,9 +97,30 @@ def fund_sponsor(
     return tx_id
 
 
-def check_sponsor_balance(client: algod.AlgodClient, address: str):
-    """Check and display sponsor wallet balance."""
+def check_sponsor_balance(
+    client: algod.AlgodClient,
+    address: str,
+    min_amount: int = 0,
+    timeout: float = 20.0,
+):
+    """
+    Check and display sponsor wallet balance.
+    
+    Args:
+        min_amount: Balance in microAlgos to wait for, polling with backoff,
+            e.g. after an unconfirmed fund_sponsor(wait=False)
+        timeout: Seconds to keep polling for min_amount
+    """
     account_info = client.account_info(address)
+    deadline = time.monotonic() + timeout
+    delay = 0.5
+    while account_info["amount"] < min_amount and time.monotonic() < deadline:
+        time.sleep(delay)
+        delay = min(delay * 2, 4.0)
+        account_info = client.account_info(address)
+    if account_info["amount"] < min_amount:
+        print(f"⚠️ Funding not visible after {timeout:.0f}s")
+    
     balance = account_info["amount"] / 1_000_000
     min_balance = account_info["min-balance"] / 1_000_000
     available = balance - min_balance
@@ -111,6 +140,8 @@ def check_sponsor_balance(client: algod.AlgodClient, address: str):
 
 
 def main():
+    import argparse
+    
     parser = argparse.ArgumentParser(
         description="Fund the sponsor wallet for gasless transactions"
     )
@@ -125,6 +156,11 @@ def main():
         action="store_true",
         help="Only check balance, don't fund"
     )
+    parser.add_argument(
+        "--no-wait",
+        action="store_true",
+        help="Don't wait for the funding confirmation; poll the balance instead"
+    )
     
     args = parser.parse_args()
     
@@ -141,9 +177,10 @@ def main():
         check_sponsor_balance(client, sponsor_address)
         return
     
+    min_amount = 0
     if args.amount > 0:
         # Load funder account
-        funder_mnemonic = os.getenv("DEPLOYER_MNEMONIC")
+        funder_mnemonic = getenv("DEPLOYER_MNEMONIC")
         if not funder_mnemonic:
             print("Error: Set DEPLOYER_MNEMONIC to fund the sponsor wallet")
             return
@@ -152,10 +189,14 @@ def main():
         funder_address = account.address_from_private_key(funder_key)
         
         # Fund the sponsor
-        fund_sponsor(client, funder_key, funder_address, sponsor_address, args.amount)
+        if args.no_wait:
+            min_amount = client.account_info(sponsor_address)["amount"] + int(args.amount * 1_000_000)
+        fund_sponsor(
+            client, funder_key, funder_address, sponsor_address, args.amount, wait=not args.no_wait
+        )
     
     # Check final balance
-    check_sponsor_balance(client, sponsor_address)
+    check_sponsor_balance(client, sponsor_address, min_amount=min_amount)
     
     print("\n" + "-" * 60)
     print("Usage Instructions")
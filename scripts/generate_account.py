@@ -9,28 +9,27 @@ Usage:
     python scripts/generate_account.py --name deployer --fund 10
 """
 
-import os
-import argparse
-from dotenv import load_dotenv
+from contextlib import ExitStack, contextmanager
 from algosdk import account, mnemonic
 from algosdk.v2client import algod
 from algosdk import kmd
 
-load_dotenv()
+from _env import getenv
+from algod_session import SessionAlgodClient, SessionKMDClient, wait_for_confirmation_fast
 
 
 def get_algod_client() -> algod.AlgodClient:
     """Create Algorand client from environment variables."""
-    server = os.getenv("ALGOD_SERVER", "http://localhost:4001")
-    token = os.getenv("ALGOD_TOKEN", "a" * 64)
-    return algod.AlgodClient(token, server)
+    server = getenv("ALGOD_SERVER", "http://localhost:4001")
+    token = getenv("ALGOD_TOKEN", "a" * 64)
+    return SessionAlgodClient(token, server)
 
 
 def get_kmd_client() -> kmd.KMDClient:
     """Create KMD client for LocalNet."""
-    server = os.getenv("KMD_SERVER", "http://localhost:4002")
-    token = os.getenv("KMD_TOKEN", "a" * 64)
-    return kmd.KMDClient(token, server)
+    server = getenv("KMD_SERVER", "http://localhost:4002")
+    token = getenv("KMD_TOKEN", "a" * 64)
+    return SessionKMDClient(token, server)
 
 
 def create_wallet(kmd_client: kmd.KMDClient, name: str, password: str = ""):
@@ -63,9 +62,32 @@ def create_wallet(kmd_client: kmd.KMDClient, name: str, password: str = ""):
         return None
 
 
+def find_wallet_id(kmd_client: kmd.KMDClient, name: str):
+    """Return the ID of the wallet with the given name, or None."""
+    for wallet in kmd_client.list_wallets():
+        if wallet["name"] == name:
+            return wallet["id"]
+    return None
+
+
+@contextmanager
+def wallet_handle(kmd_client: kmd.KMDClient, wallet_id: str, password: str = ""):
+    """
+    Unlock a wallet for the duration of a with-block.
+    
+    Yields:
+        Wallet handle token, released on exit
+    """
+    handle = kmd_client.init_wallet_handle(wallet_id, password)
+    try:
+        yield handle
+    finally:
+        kmd_client.release_wallet_handle(handle)
+
+
 def generate_account_in_wallet(
     kmd_client: kmd.KMDClient, 
-    wallet_id: str, 
+    handle: str, 
     password: str = ""
 ) -> tuple[str, str]:
     """
@@ -73,24 +95,18 @@ def generate_account_in_wallet(
     
     Args:
         kmd_client: KMD client instance
-        wallet_id: Wallet ID
+        handle: Wallet handle from wallet_handle()
         password: Wallet password
         
     Returns:
         Tuple of (address, private_key)
     """
     try:
-        # Get wallet handle
-        wallet_handle = kmd_client.init_wallet_handle(wallet_id, password)
-        
         # Generate new account
-        address = kmd_client.generate_key(wallet_handle)
+        address = kmd_client.generate_key(handle)
         
         # Export the private key
-        private_key = kmd_client.export_key(wallet_handle, password, address)
-        
-        # Release wallet handle
-        kmd_client.release_wallet_handle(wallet_handle)
+        private_key = kmd_client.export_key(handle, password, address)
         
         return address, private_key
     except Exception as e:
@@ -111,49 +127,41 @@ def generate_standalone_account() -> tuple[str, str, str]:
     return address, private_key, mnemonic_phrase
 
 
-def get_account_from_kmd(kmd_client: kmd.KMDClient, name: str, password: str = ""):
+def get_account_from_kmd(kmd_client: kmd.KMDClient, handle: str, password: str = ""):
     """
-    Get or create an account from LocalNet's KMD by name.
-    If the wallet/account doesn't exist, it will be created.
+    Get the first account of an unlocked KMD wallet, generating one if the
+    wallet is empty.
     
     Similar to: algorand_client.account.from_kmd(name="ACCOUNT_NAME")
     
     Args:
         kmd_client: KMD client instance
-        name: Account/wallet name
+        handle: Wallet handle from wallet_handle()
         password: Wallet password
         
     Returns:
         Tuple of (address, private_key)
     """
-    # Create or get wallet
-    wallet_id = create_wallet(kmd_client, name, password)
-    if not wallet_id:
-        return None, None
-    
-    # Get wallet handle
-    wallet_handle = kmd_client.init_wallet_handle(wallet_id, password)
-    
     # List existing keys
-    keys = kmd_client.list_keys(wallet_handle)
+    keys = kmd_client.list_keys(handle)
     
     if keys:
         # Return existing account
         address = keys[0]
-        private_key = kmd_client.export_key(wallet_handle, password, address)
+        private_key = kmd_client.export_key(handle, password, address)
         print(f"📍 Using existing account: {address}")
     else:
         # Generate new account
-        address, private_key = generate_account_in_wallet(kmd_client, wallet_id, password)
+        address, private_key = generate_account_in_wallet(kmd_client, handle, password)
         print(f"✅ Generated new account: {address}")
     
-    kmd_client.release_wallet_handle(wallet_handle)
     return address, private_key
 
 
 def fund_from_dispenser(
     algod_client: algod.AlgodClient,
     kmd_client: kmd.KMDClient,
+    dispenser_handle: str,
     receiver: str,
     amount_algo: float = 10
 ):
@@ -163,34 +171,20 @@ def fund_from_dispenser(
     Args:
         algod_client: Algorand client
         kmd_client: KMD client
+        dispenser_handle: Wallet handle of the default LocalNet wallet
         receiver: Address to fund
         amount_algo: Amount in ALGO
     """
     try:
-        # Get the default funded wallet on LocalNet
-        wallets = kmd_client.list_wallets()
-        default_wallet = None
-        
-        for wallet in wallets:
-            if wallet["name"] == "unencrypted-default-wallet":
-                default_wallet = wallet
-                break
-        
-        if not default_wallet:
-            print("❌ Default wallet not found. Make sure LocalNet is running.")
-            return
-        
-        # Get wallet handle and first account (dispenser)
-        wallet_handle = kmd_client.init_wallet_handle(default_wallet["id"], "")
-        keys = kmd_client.list_keys(wallet_handle)
+        # First account of the default wallet is the dispenser
+        keys = kmd_client.list_keys(dispenser_handle)
         
         if not keys:
             print("❌ No accounts in default wallet")
             return
         
         dispenser_address = keys[0]
-        dispenser_key = kmd_client.export_key(wallet_handle, "", dispenser_address)
-        kmd_client.release_wallet_handle(wallet_handle)
+        dispenser_key = kmd_client.export_key(dispenser_handle, "", dispenser_address)
         
         # Send payment
         from algosdk import transaction
@@ -207,7 +201,7 @@ def fund_from_dispenser(
         
         signed_txn = txn.sign(dispenser_key)
         tx_id = algod_client.send_transaction(signed_txn)
-        transaction.wait_for_confirmation(algod_client, tx_id, 4)
+        wait_for_confirmation_fast(algod_client, tx_id)
         
         print(f"✅ Funded {receiver} with {amount_algo} ALGO")
         print(f"   Transaction: {tx_id}")
@@ -228,6 +222,8 @@ def check_balance(algod_client: algod.AlgodClient, address: str):
 
 
 def main():
+    import argparse
+    
     parser = argparse.ArgumentParser(description="Generate accounts for Cresca Campus")
     parser.add_argument(
         "--name", 
@@ -276,13 +272,24 @@ def main():
         algod_client = get_algod_client()
         kmd_client = get_kmd_client()
         
-        address, private_key = get_account_from_kmd(kmd_client, args.name)
+        # Each wallet is unlocked once and released when the block exits
+        with ExitStack() as stack:
+            address, private_key = None, None
+            wallet_id = create_wallet(kmd_client, args.name)
+            if wallet_id:
+                handle = stack.enter_context(wallet_handle(kmd_client, wallet_id))
+                address, private_key = get_account_from_kmd(kmd_client, handle)
+            
+            if address and args.fund > 0:
+                print(f"\n💸 Funding account with {args.fund} ALGO...")
+                default_wallet_id = find_wallet_id(kmd_client, "unencrypted-default-wallet")
+                if not default_wallet_id:
+                    print("❌ Default wallet not found. Make sure LocalNet is running.")
+                else:
+                    dispenser_handle = stack.enter_context(wallet_handle(kmd_client, default_wallet_id))
+                    fund_from_dispenser(algod_client, kmd_client, dispenser_handle, address, args.fund)
         
         if address:
-            if args.fund > 0:
-                print(f"\n💸 Funding account with {args.fund} ALGO...")
-                fund_from_dispenser(algod_client, kmd_client, address, args.fund)
-            
             check_balance(algod_client, address)
             
             # Export mnemonic for reference
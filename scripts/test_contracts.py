@@ -4,13 +4,15 @@ Test Deployed Contracts on Algorand Testnet
 Tests basic functionality of all deployed contracts.
 """
 
-import os
 import base64
-from dotenv import load_dotenv
+import struct
+from concurrent.futures import ThreadPoolExecutor
 from algosdk import account, mnemonic, transaction
-from algosdk.v2client import algod
+from algosdk.error import AlgodHTTPError
+from algosdk.v2client import indexer
 
-load_dotenv()
+from _env import getenv
+from algod_session import SessionAlgodClient, get_suggested_params, wait_for_confirmation_fast
 
 # Contract App IDs (from deployment)
 EXPENSE_SPLITTER_APP_ID = 755399831
@@ -18,46 +20,82 @@ DAO_TREASURY_APP_ID = 755399773
 SOULBOUND_TICKET_APP_ID = 755399774
 FUNDRAISING_APP_ID = 755399775
 
+# The expense splitter keeps its counters packed in one 64-byte global 's':
+# member_count (8) + expense_count (8) + is_settled (8) + total_pool (8) + creator (32)
+SPLIT_STATE_FIELDS = ('member_count', 'expense_count', 'is_settled', 'total_pool')
+
 # Setup
-client = algod.AlgodClient('', 'https://testnet-api.algonode.cloud')
-private_key = mnemonic.to_private_key(os.getenv('DEPLOYER_MNEMONIC'))
+client = SessionAlgodClient('', 'https://testnet-api.algonode.cloud')
+private_key = mnemonic.to_private_key(getenv('DEPLOYER_MNEMONIC'))
 deployer = account.address_from_private_key(private_key)
 
+# Optionally serve global-state reads from the indexer to keep them off algod.
+# The indexer trails algod by a round or two, so reads right after a call may
+# still show the previous state.
+idx = None
+if getenv('USE_INDEXER'):
+    idx = indexer.IndexerClient(
+        getenv('INDEXER_TOKEN', ''),
+        getenv('INDEXER_SERVER', 'https://testnet-idx.algonode.cloud'),
+    )
 
-def call_app(app_id, args, on_complete=transaction.OnComplete.NoOpOC):
-    """Call an application with given arguments."""
-    params = client.suggested_params()
-    
-    txn = transaction.ApplicationCallTxn(
+
+def build_app_call(app_id, args, on_complete=transaction.OnComplete.NoOpOC, params=None):
+    """Build an unsigned application call transaction."""
+    return transaction.ApplicationCallTxn(
         sender=deployer,
-        sp=params,
+        sp=params or get_suggested_params(client),
         index=app_id,
         on_complete=on_complete,
         app_args=args,
     )
+
+
+def call_app(app_id, args, on_complete=transaction.OnComplete.NoOpOC):
+    """Call an application with given arguments."""
+    txn = build_app_call(app_id, args, on_complete)
     
     signed = txn.sign(private_key)
     tx_id = client.send_transaction(signed)
-    result = transaction.wait_for_confirmation(client, tx_id, 4)
+    result = wait_for_confirmation_fast(client, tx_id)
     
     return tx_id, result
 
 
 def read_global_state(app_id):
     """Read global state of an application."""
-    app_info = client.application_info(app_id)
+    if idx is not None:
+        app_info = idx.applications(app_id)['application']
+    else:
+        app_info = client.application_info(app_id)
+    items = app_info.get('params', {}).get('global-state', ())
+    b64decode = base64.b64decode
     
-    state = {}
-    if 'params' in app_info and 'global-state' in app_info['params']:
-        for item in app_info['params']['global-state']:
-            key = base64.b64decode(item['key']).decode('utf-8')
-            value = item['value']
-            if value['type'] == 1:  # bytes
-                state[key] = base64.b64decode(value['bytes'])
-            else:  # uint
-                state[key] = value['uint']
-    
-    return state
+    # type 1 is bytes, type 2 is uint
+    return {
+        b64decode(item['key']).decode('utf-8'):
+            b64decode(item['value']['bytes']) if item['value']['type'] == 1 else item['value']['uint']
+        for item in items
+    }
+
+
+def decode_split_state(state):
+    """Expand the expense splitter's packed 's' value into named fields."""
+    packed = state.get('s')
+    if packed is None:
+        return state
+    return {**state, **dict(zip(SPLIT_STATE_FIELDS, struct.unpack_from('>4Q', packed)))}
+
+
+def decode_logs(result):
+    """Decode the base64 log entries of a confirmed transaction."""
+    return list(map(base64.b64decode, result.get('logs', ())))
+
+
+def read_global_states(app_ids):
+    """Read the global state of several applications concurrently."""
+    with ThreadPoolExecutor(max_workers=len(app_ids)) as executor:
+        return dict(zip(app_ids, executor.map(read_global_state, app_ids)))
 
 
 def test_expense_splitter():
@@ -70,7 +108,7 @@ def test_expense_splitter():
     
     # Read initial state
     print("\n1. Reading initial state...")
-    state = read_global_state(app_id)
+    state = decode_split_state(read_global_state(app_id))
     print(f"   Member count: {state.get('member_count', 0)}")
     print(f"   Expense count: {state.get('expense_count', 0)}")
     print(f"   Is settled: {state.get('is_settled', 0)}")
@@ -88,7 +126,7 @@ def test_expense_splitter():
     
     # Read updated state
     print("\n3. Reading updated state...")
-    state = read_global_state(app_id)
+    state = decode_split_state(read_global_state(app_id))
     print(f"   Member count: {state.get('member_count', 0)}")
     
     print("\n✅ Expense Splitter tests passed!")
@@ -142,10 +180,8 @@ def test_soulbound_ticket():
         tx_id, result = call_app(app_id, [b"create_event"])
         print(f"   ✅ Event created! TX: {tx_id}")
         
-        # Check logs
-        if 'logs' in result:
-            for log in result['logs']:
-                print(f"   Log: {base64.b64decode(log)}")
+        for log in decode_logs(result):
+            print(f"   Log: {log}")
     except Exception as e:
         print(f"   ⚠️ Create event: {e}")
     
@@ -176,9 +212,8 @@ def test_fundraising():
         tx_id, result = call_app(app_id, [b"create_campaign"])
         print(f"   ✅ Campaign created! TX: {tx_id}")
         
-        if 'logs' in result:
-            for log in result['logs']:
-                print(f"   Log: {base64.b64decode(log)}")
+        for log in decode_logs(result):
+            print(f"   Log: {log}")
     except Exception as e:
         print(f"   ⚠️ Create campaign: {e}")
     
@@ -190,7 +225,94 @@ def test_fundraising():
     print("\n✅ Fundraising tests passed!")
 
 
+def run_tests_batched(account_info):
+    """
+    Send the test calls for all contracts as one atomic group, so the
+    whole suite waits on a single confirmation.
+    
+    Opt-ins the deployer already holds (per `account_info`) are left out
+    of the group. If algod rejects the group, the per-contract tests run
+    one by one instead. Once accepted, a confirmation timeout is raised
+    rather than retried, as the group may still be applied.
+    
+    Returns:
+        Total fees paid in microAlgos, or None if the fallback ran
+    """
+    print("\n" + "=" * 50)
+    print("🧪 TEST: All contracts (batched)")
+    print("=" * 50)
+    
+    opted_in = {
+        app["id"] for app in account_info.get("apps-local-state", [])
+    }
+    params = get_suggested_params(client)
+    
+    calls = []
+    for name, app_id in (
+        ("Expense Splitter opt-in", EXPENSE_SPLITTER_APP_ID),
+        ("DAO Treasury opt-in", DAO_TREASURY_APP_ID),
+    ):
+        if app_id in opted_in:
+            print(f"   ℹ️ {name}: already opted in")
+        else:
+            calls.append((name, build_app_call(app_id, [], transaction.OnComplete.OptInOC, params)))
+    calls.append(("Soulbound Ticket create_event", build_app_call(SOULBOUND_TICKET_APP_ID, [b"create_event"], params=params)))
+    calls.append(("Fundraising create_campaign", build_app_call(FUNDRAISING_APP_ID, [b"create_campaign"], params=params)))
+    
+    txns = [txn for _, txn in calls]
+    transaction.assign_group_id(txns)
+    signed_txns = [txn.sign(private_key) for txn in txns]
+    tx_ids = [txn.get_txid() for txn in txns]
+    
+    try:
+        client.send_transactions(signed_txns)
+    except AlgodHTTPError as e:
+        print(f"   ⚠️ Group rejected, falling back to individual calls: {e}")
+        test_expense_splitter()
+        test_dao_treasury()
+        test_soulbound_ticket()
+        test_fundraising()
+        return None
+    
+    try:
+        wait_for_confirmation_fast(client, tx_ids[0])
+    except Exception:
+        print(f"   ❌ Group {tx_ids[0]} sent but not confirmed")
+        raise
+    
+    print(f"   ✅ Group of {len(txns)} confirmed")
+    total_fees = 0
+    for (name, _), tx_id in zip(calls, tx_ids):
+        result = client.pending_transaction_info(tx_id)
+        total_fees += result["txn"]["txn"].get("fee", 0)
+        print(f"   ✅ {name}: {tx_id}")
+        for log in decode_logs(result):
+            print(f"      Log: {log}")
+    
+    print("\nReading updated state...")
+    states = read_global_states([
+        EXPENSE_SPLITTER_APP_ID, DAO_TREASURY_APP_ID, SOULBOUND_TICKET_APP_ID, FUNDRAISING_APP_ID,
+    ])
+    print(f"   Expense Splitter members: {decode_split_state(states[EXPENSE_SPLITTER_APP_ID]).get('member_count', 0)}")
+    print(f"   DAO Treasury signers: {states[DAO_TREASURY_APP_ID].get('signer_count', 0)}")
+    print(f"   Soulbound Ticket events: {states[SOULBOUND_TICKET_APP_ID].get('event_count', 0)}")
+    print(f"   Fundraising campaigns: {states[FUNDRAISING_APP_ID].get('campaign_count', 0)}")
+    
+    print("\n✅ Batched tests passed!")
+    return total_fees
+
+
 def main():
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Test deployed Cresca Campus contracts")
+    parser.add_argument(
+        "--verify-balance",
+        action="store_true",
+        help="Re-read the final balance from algod instead of deriving it from fees"
+    )
+    args = parser.parse_args()
+    
     print("\n" + "=" * 60)
     print("🏫 CRESCA CAMPUS - CONTRACT TESTING")
     print("=" * 60)
@@ -204,18 +326,19 @@ def main():
     print(f"💰 Balance: {balance:.4f} ALGO")
     
     # Run tests
-    test_expense_splitter()
-    test_dao_treasury()
-    test_soulbound_ticket()
-    test_fundraising()
+    total_fees = run_tests_batched(info)
     
     print("\n" + "=" * 60)
     print("🎉 ALL TESTS COMPLETED!")
     print("=" * 60)
     
-    # Final balance
-    info = client.account_info(deployer)
-    final_balance = info["amount"] / 1_000_000
+    # Final balance: the test calls only move fees, so derive it unless
+    # the fallback ran or an authoritative read was requested
+    if total_fees is None or args.verify_balance:
+        info = client.account_info(deployer)
+        final_balance = info["amount"] / 1_000_000
+    else:
+        final_balance = balance - total_fees / 1_000_000
     print(f"\n💰 Final Balance: {final_balance:.4f} ALGO")
     print(f"💸 Test Cost: {balance - final_balance:.4f} ALGO\n")
 
@@ -0,0 +1,20 @@
+"""
+Shared fixtures for the contract test suites.
+"""
+
+import pytest
+from algopy_testing import AlgopyTestContext, algopy_testing_context
+
+
+@pytest.fixture(scope="session")
+def _root_context() -> AlgopyTestContext:
+    """Enter the testing context once for the whole session."""
+    with algopy_testing_context() as ctx:
+        yield ctx
+
+
+@pytest.fixture
+def context(_root_context: AlgopyTestContext) -> AlgopyTestContext:
+    """Hand each test the shared context with ledger and transaction state cleared."""
+    _root_context.reset()
+    return _root_context
@@ -0,0 +1,64 @@
+"""
+Tests for contract creation
+
+Every contract starts with its counters at zero; the DAO Treasury also
+stores the threshold it was created with. Contracts with an info getter
+must report the same values through it.
+"""
+
+import pytest
+from algopy.arc4 import UInt64 as ARC4UInt64
+from algopy_testing import AlgopyTestContext
+from contracts.dao_treasury.contract import DAOTreasury
+from contracts.expense_splitter.contract import ExpenseSplitter
+from contracts.fundraising.contract import FundraisingEscrow
+from contracts.soulbound_ticket.contract import SoulboundTicket
+
+
+@pytest.mark.parametrize(
+    "contract_cls, create_args, expected_state, info_getter, expected_info",
+    [
+        (
+            DAOTreasury,
+            (ARC4UInt64(2),),  # 2-of-N
+            lambda ctx: {"threshold": 2, "signer_count": 0, "proposal_count": 0},
+            "get_treasury_info",
+            (2, 0, 0),  # threshold, signer_count, proposal_count
+        ),
+        (
+            ExpenseSplitter,
+            (),
+            lambda ctx: {
+                "creator": ctx.default_sender,
+                "member_count": 0,
+                "expense_count": 0,
+                "is_settled": 0,
+                "total_pool": 0,
+            },
+            "get_split_info",
+            (0, 0, 0, False),  # member_count, expense_count, total_pool, is_settled
+        ),
+        (FundraisingEscrow, (), lambda ctx: {"campaign_count": 0}, None, None),
+        (SoulboundTicket, (), lambda ctx: {"event_count": 0}, None, None),
+    ],
+    ids=["dao_treasury", "expense_splitter", "fundraising", "soulbound_ticket"],
+)
+def test_create(
+    context: AlgopyTestContext, contract_cls, create_args, expected_state, info_getter, expected_info
+):
+    """Test creating each contract initializes its global state."""
+    # Act
+    contract = contract_cls()
+    contract.create(*create_args)
+    
+    # Assert
+    for attr, expected in expected_state(context).items():
+        assert getattr(contract, attr).value == expected, attr
+    
+    if info_getter:
+        info = getattr(contract, info_getter)().native
+        assert tuple(info[:len(expected_info)]) == expected_info
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
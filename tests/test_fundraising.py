@@ -11,44 +11,74 @@ Tests cover:
 """
 
 import pytest
-from algopy_testing import AlgopyTestContext, algopy_testing_context
-from contracts.fundraising.contract import FundraisingEscrow
+from algopy import UInt64
+from algopy.arc4 import UInt64 as ARC4UInt64, Address, Bool, DynamicArray, String
+from algopy_testing import AlgopyTestContext
+from contracts.fundraising.contract import FundraisingEscrow, MAX_DEADLINE_DELTA
+
+CAMPAIGN_GOAL = 10_000_000  # 10 ALGO
+CAMPAIGN_DEADLINE = 2000000000  # Future timestamp
+
+
+def batch_donate(
+    context: AlgopyTestContext,
+    contract: FundraisingEscrow,
+    campaign_id: ARC4UInt64,
+    donors: list,
+    amount: int,
+    paid: int | None = None,
+) -> None:
+    """Batch donate amount per donor as the default sender (the aggregator),
+    paying the batch total, or paid if given, in the same group."""
+    payment = context.any.txn.payment(
+        sender=context.default_sender,
+        receiver=context.ledger.get_app(contract).address,
+        amount=UInt64(amount * len(donors) if paid is None else paid),
+    )
+    call = context.txn.defer_app_call(
+        contract.batch_donate,
+        campaign_id,
+        ARC4UInt64(0),
+        DynamicArray[Address](*(Address(donor.bytes) for donor in donors)),
+        DynamicArray[ARC4UInt64](*(ARC4UInt64(amount) for _ in donors)),
+    )
+    with context.txn.create_group([payment, call]):
+        call.submit()
 
 
 class TestFundraisingEscrow:
     """Test suite for FundraisingEscrow contract."""
     
     @pytest.fixture
-    def context(self) -> AlgopyTestContext:
-        """Create a fresh testing context for each test."""
-        with algopy_testing_context() as ctx:
-            yield ctx
-    
-    def test_create_contract(self, context: AlgopyTestContext):
-        """Test creating the fundraising contract."""
-        # Act
+    def contract(self, context: AlgopyTestContext) -> FundraisingEscrow:
+        """Create a fundraising contract for the test."""
         contract = FundraisingEscrow()
         contract.create()
-        
-        # Assert
-        assert contract.campaign_count.value == 0
+        return contract
+    
+    @pytest.fixture
+    def campaign(self, context: AlgopyTestContext, contract: FundraisingEscrow) -> tuple:
+        """Create an active campaign; returns (campaign_id, beneficiary)."""
+        beneficiary = context.any.account()
+        campaign_id = contract.create_campaign(
+            beneficiary=Address(beneficiary.bytes),
+            goal=ARC4UInt64(CAMPAIGN_GOAL),
+            deadline=ARC4UInt64(CAMPAIGN_DEADLINE),
+            title=String("Campaign"),
+            description=String("Description")
+        )
+        return campaign_id, beneficiary
     
-    def test_create_campaign(self, context: AlgopyTestContext):
+    def test_create_campaign(self, context: AlgopyTestContext, contract: FundraisingEscrow):
         """Test creating a fundraising campaign."""
         # Arrange
-        from algopy.arc4 import UInt64 as ARC4UInt64, String, Address
-        
-        contract = FundraisingEscrow()
-        contract.create()
-        
         beneficiary = context.any.account()
-        future_deadline = context.any.uint64(min_value=2000000000)  # Future timestamp
         
         # Act
         campaign_id = contract.create_campaign(
             beneficiary=Address(beneficiary.bytes),
             goal=ARC4UInt64(10_000_000),  # 10 ALGO
-            deadline=ARC4UInt64(future_deadline),
+            deadline=ARC4UInt64(CAMPAIGN_DEADLINE),
             title=String("Medical Emergency Fund"),
             description=String("Help a student with medical bills")
         )
@@ -57,23 +87,26 @@ class TestFundraisingEscrow:
         assert campaign_id.native == 0
         assert contract.campaign_count.value == 1
     
-    def test_add_milestone(self, context: AlgopyTestContext):
-        """Test adding a milestone to campaign."""
+    def test_create_campaign_deadline_too_far(self, context: AlgopyTestContext, contract: FundraisingEscrow):
+        """Test that deadlines past the 4-byte donation time offset are rejected."""
         # Arrange
-        from algopy.arc4 import UInt64 as ARC4UInt64, String, Address
+        now = 1_700_000_000
+        context.ledger.patch_global_fields(latest_timestamp=UInt64(now))
         
-        contract = FundraisingEscrow()
-        contract.create()
-        
-        beneficiary = context.any.account()
-        
-        campaign_id = contract.create_campaign(
-            beneficiary=Address(beneficiary.bytes),
-            goal=ARC4UInt64(10_000_000),
-            deadline=ARC4UInt64(2000000000),
-            title=String("Project Fund"),
-            description=String("Fund a project")
-        )
+        # Act & Assert
+        with pytest.raises(AssertionError, match="Deadline too far"):
+            contract.create_campaign(
+                beneficiary=Address(context.any.account().bytes),
+                goal=ARC4UInt64(CAMPAIGN_GOAL),
+                deadline=ARC4UInt64(now + MAX_DEADLINE_DELTA + 1),
+                title=String("Campaign"),
+                description=String("Description")
+            )
+    
+    def test_add_milestone(self, context: AlgopyTestContext, contract: FundraisingEscrow, campaign: tuple):
+        """Test adding a milestone to campaign."""
+        # Arrange
+        campaign_id, _ = campaign
         
         # Act
         milestone_id = contract.add_milestone(
@@ -85,78 +118,79 @@ class TestFundraisingEscrow:
         # Assert
         assert milestone_id.native == 0
     
-    def test_only_creator_can_add_milestone(self, context: AlgopyTestContext):
+    def test_only_creator_can_add_milestone(self, context: AlgopyTestContext, contract: FundraisingEscrow, campaign: tuple):
         """Test that only campaign creator can add milestones."""
         # Arrange
-        from algopy.arc4 import UInt64 as ARC4UInt64, String, Address
-        
-        contract = FundraisingEscrow()
-        contract.create()
-        
-        beneficiary = context.any.account()
-        
-        campaign_id = contract.create_campaign(
-            beneficiary=Address(beneficiary.bytes),
-            goal=ARC4UInt64(10_000_000),
-            deadline=ARC4UInt64(2000000000),
-            title=String("Project"),
-            description=String("Description")
-        )
+        campaign_id, _ = campaign
         
-        # Switch to different user
         other_user = context.any.account()
-        context.set_sender(other_user)
         
         # Act & Assert
-        with pytest.raises(AssertionError, match="Only creator can add milestones"):
-            contract.add_milestone(
-                campaign_id=campaign_id,
-                description=String("Unauthorized milestone"),
-                amount=ARC4UInt64(1_000_000)
-            )
+        with context.txn.create_group(active_txn_overrides={"sender": other_user}):
+            with pytest.raises(AssertionError, match="Only creator can add milestones"):
+                contract.add_milestone(
+                    campaign_id=campaign_id,
+                    description=String("Unauthorized milestone"),
+                    amount=ARC4UInt64(1_000_000)
+                )
     
-    def test_get_campaign(self, context: AlgopyTestContext):
-        """Test getting campaign details."""
+    def test_complete_milestone(self, context: AlgopyTestContext, contract: FundraisingEscrow, campaign: tuple):
+        """Test that completing a milestone only flips its completed flag."""
         # Arrange
-        from algopy.arc4 import UInt64 as ARC4UInt64, String, Address
-        
-        contract = FundraisingEscrow()
-        contract.create()
+        campaign_id, _ = campaign
+        milestone_id = contract.add_milestone(
+            campaign_id=campaign_id,
+            description=String("Phase 1 Complete"),
+            amount=ARC4UInt64(5_000_000)
+        )
         
-        beneficiary = context.any.account()
-        goal = 10_000_000
-        deadline = 2000000000
+        # Act
+        contract.complete_milestone(campaign_id, milestone_id, String("Receipts"))
         
-        campaign_id = contract.create_campaign(
-            beneficiary=Address(beneficiary.bytes),
-            goal=ARC4UInt64(goal),
-            deadline=ARC4UInt64(deadline),
-            title=String("Test Campaign"),
-            description=String("Test description")
+        # Assert
+        amount, released, is_completed = contract.get_milestone(campaign_id, milestone_id).native
+        assert amount == 5_000_000
+        assert released == 0
+        assert is_completed == True
+    
+    def test_only_creator_can_complete_and_release(self, context: AlgopyTestContext, contract: FundraisingEscrow, campaign: tuple):
+        """Test that the fused payout path is restricted to the campaign creator."""
+        # Arrange
+        campaign_id, beneficiary = campaign
+        milestone_id = contract.add_milestone(
+            campaign_id=campaign_id,
+            description=String("Phase 1 Complete"),
+            amount=ARC4UInt64(5_000_000)
         )
         
+        # Act & Assert
+        with context.txn.create_group(active_txn_overrides={"sender": beneficiary}):
+            with pytest.raises(AssertionError, match="Only creator can complete milestones"):
+                contract.complete_and_release(campaign_id, milestone_id, String("Receipts"))
+    
+    def test_get_campaign(self, context: AlgopyTestContext, contract: FundraisingEscrow, campaign: tuple):
+        """Test getting campaign details."""
+        # Arrange
+        campaign_id, beneficiary = campaign
+        
         # Act
         result = contract.get_campaign(campaign_id)
         creator, returned_beneficiary, returned_goal, raised, returned_deadline, status = result.native
         
         # Assert
-        assert returned_goal == goal
+        assert returned_goal == CAMPAIGN_GOAL
         assert raised == 0
-        assert returned_deadline == deadline
+        assert returned_deadline == CAMPAIGN_DEADLINE
         assert status == 0  # STATUS_ACTIVE
     
-    def test_get_campaign_count(self, context: AlgopyTestContext):
+    @pytest.mark.parametrize("n_campaigns", [0, 1, 3])
+    def test_get_campaign_count(self, context: AlgopyTestContext, contract: FundraisingEscrow, n_campaigns: int):
         """Test getting campaign count."""
         # Arrange
-        from algopy.arc4 import UInt64 as ARC4UInt64, String, Address
-        
-        contract = FundraisingEscrow()
-        contract.create()
-        
         beneficiary = context.any.account()
         
         # Create multiple campaigns
-        for i in range(3):
+        for i in range(n_campaigns):
             contract.create_campaign(
                 beneficiary=Address(beneficiary.bytes),
                 goal=ARC4UInt64(1_000_000 * (i + 1)),
@@ -169,53 +203,113 @@ class TestFundraisingEscrow:
         count = contract.get_campaign_count()
         
         # Assert
-        assert count.native == 3
+        assert count.native == n_campaigns
     
-    def test_get_my_donation_no_donation(self, context: AlgopyTestContext):
+    def test_get_my_donation_no_donation(self, context: AlgopyTestContext, contract: FundraisingEscrow, campaign: tuple):
         """Test getting donation when none was made."""
         # Arrange
-        from algopy.arc4 import UInt64 as ARC4UInt64, String, Address
+        campaign_id, _ = campaign
         
-        contract = FundraisingEscrow()
-        contract.create()
+        new_user = context.any.account()
         
-        beneficiary = context.any.account()
+        # Act
+        with context.txn.create_group(active_txn_overrides={"sender": new_user}):
+            donation = contract.get_my_donation(campaign_id)
         
-        campaign_id = contract.create_campaign(
-            beneficiary=Address(beneficiary.bytes),
-            goal=ARC4UInt64(10_000_000),
-            deadline=ARC4UInt64(2000000000),
-            title=String("Campaign"),
-            description=String("Description")
-        )
+        # Assert
+        assert donation.native == 0
+    
+    def test_get_donation_out_of_range(self, context: AlgopyTestContext, contract: FundraisingEscrow, campaign: tuple):
+        """Test reading a donation index past the end of the log."""
+        # Arrange
+        campaign_id, _ = campaign
         
-        # Switch to different user
-        new_user = context.any.account()
-        context.set_sender(new_user)
+        # Act & Assert - no donations have been logged yet
+        with pytest.raises(AssertionError, match="Donation does not exist"):
+            contract.get_donation(campaign_id, ARC4UInt64(0))
+    
+    @pytest.mark.parametrize("anonymous", [False, True])
+    def test_donate(self, context: AlgopyTestContext, contract: FundraisingEscrow, campaign: tuple, anonymous: bool):
+        """Test that a donation is logged, counted and added to the donor's total."""
+        # Arrange
+        campaign_id, _ = campaign
+        donor = context.any.account()
+        
+        # Act
+        with context.txn.create_group(active_txn_overrides={"sender": donor}):
+            contract.donate(campaign_id, ARC4UInt64(1_000_000), Bool(anonymous))
+        
+        # Assert - anonymous donations are logged under the zero address
+        logged_donor, amount, _ = contract.get_donation(campaign_id, ARC4UInt64(0)).native
+        expected_donor = bytes(32) if anonymous else donor.bytes.value
+        assert logged_donor.bytes.value == expected_donor
+        assert amount == 1_000_000
+        with context.txn.create_group(active_txn_overrides={"sender": donor}):
+            assert contract.get_my_donation(campaign_id).native == 1_000_000
+        _, _, _, raised, _, _ = contract.get_campaign(campaign_id).native
+        assert raised == 1_000_000
+    
+    def test_donation_log_spans_pages(self, context: AlgopyTestContext, contract: FundraisingEscrow, campaign: tuple):
+        """Test that donations past the first 23 are logged to the next page."""
+        # Arrange
+        campaign_id, _ = campaign
+        donors = [context.any.account() for _ in range(24)]
+        
+        # Act - the creator is the aggregator
+        for batch in (donors[:16], donors[16:]):
+            batch_donate(context, contract, campaign_id, batch, amount=1_000)
+        
+        # Assert
+        logged_donor, amount, _ = contract.get_donation(campaign_id, ARC4UInt64(23)).native
+        assert logged_donor.bytes.value == donors[23].bytes.value
+        assert amount == 1_000
+    
+    def test_get_donation_timestamp(self, context: AlgopyTestContext, contract: FundraisingEscrow, campaign: tuple):
+        """Test that the donation time is recovered from its stored offset to the deadline."""
+        # Arrange
+        campaign_id, _ = campaign
+        donated_at = 1_700_000_000
+        context.ledger.patch_global_fields(latest_timestamp=UInt64(donated_at))
+        contract.donate(campaign_id, ARC4UInt64(1_000_000), Bool(False))
         
         # Act
-        donation = contract.get_my_donation(campaign_id)
+        _, amount, timestamp = contract.get_donation(campaign_id, ARC4UInt64(0)).native
         
         # Assert
-        assert donation.native == 0
+        assert amount == 1_000_000
+        assert timestamp == donated_at
     
-    def test_cancel_campaign(self, context: AlgopyTestContext):
-        """Test campaign cancellation."""
+    def test_only_aggregator_can_batch_donate(self, context: AlgopyTestContext, contract: FundraisingEscrow, campaign: tuple):
+        """Test that batched donations are restricted to the aggregator."""
         # Arrange
-        from algopy.arc4 import UInt64 as ARC4UInt64, String, Address
+        campaign_id, _ = campaign
         
-        contract = FundraisingEscrow()
-        contract.create()
+        donor = context.any.account()
         
-        beneficiary = context.any.account()
+        # Act & Assert
+        with context.txn.create_group(active_txn_overrides={"sender": donor}):
+            with pytest.raises(AssertionError, match="Only aggregator can batch donate"):
+                contract.batch_donate(
+                    campaign_id,
+                    ARC4UInt64(0),
+                    DynamicArray[Address](Address(donor.bytes)),
+                    DynamicArray[ARC4UInt64](ARC4UInt64(1_000_000)),
+                )
+    
+    def test_batch_donate_requires_payment(self, context: AlgopyTestContext, contract: FundraisingEscrow, campaign: tuple):
+        """Test that a batch can't credit more than the aggregator paid."""
+        # Arrange
+        campaign_id, _ = campaign
+        donors = [context.any.account() for _ in range(2)]
         
-        campaign_id = contract.create_campaign(
-            beneficiary=Address(beneficiary.bytes),
-            goal=ARC4UInt64(10_000_000),
-            deadline=ARC4UInt64(2000000000),
-            title=String("Cancellable Campaign"),
-            description=String("This will be cancelled")
-        )
+        # Act & Assert
+        with pytest.raises(AssertionError, match="Payment must equal the batch total"):
+            batch_donate(context, contract, campaign_id, donors, amount=1_000, paid=1_000)
+    
+    def test_cancel_campaign(self, context: AlgopyTestContext, contract: FundraisingEscrow, campaign: tuple):
+        """Test campaign cancellation."""
+        # Arrange
+        campaign_id, _ = campaign
         
         # Act
         contract.cancel_campaign(campaign_id)
@@ -224,6 +318,24 @@ class TestFundraisingEscrow:
         result = contract.get_campaign(campaign_id)
         _, _, _, _, _, status = result.native
         assert status == 2  # STATUS_FAILED
+    
+    def test_claim_refund_requires_failed_campaign(self, context: AlgopyTestContext, contract: FundraisingEscrow, campaign: tuple):
+        """Test that refunds are only open once a campaign has failed."""
+        # Arrange
+        campaign_id, _ = campaign
+        
+        # Act & Assert
+        with pytest.raises(AssertionError, match="Campaign not failed"):
+            contract.claim_refund(campaign_id)
+    
+    def test_purge_requires_failed_campaign(self, context: AlgopyTestContext, contract: FundraisingEscrow, campaign: tuple):
+        """Test that only failed campaigns can be purged."""
+        # Arrange
+        campaign_id, _ = campaign
+        
+        # Act & Assert
+        with pytest.raises(AssertionError, match="Campaign not failed"):
+            contract.purge_failed_campaign(campaign_id)
 
 
 if __name__ == "__main__":
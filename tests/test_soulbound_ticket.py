@@ -10,36 +10,43 @@ Tests cover:
 """
 
 import pytest
-from algopy_testing import AlgopyTestContext, algopy_testing_context
+from algopy import UInt64
+from algopy.arc4 import UInt64 as ARC4UInt64, Address, String
+from algopy_testing import AlgopyTestContext
 from contracts.soulbound_ticket.contract import SoulboundTicket
 
 
+def buy(
+    context: AlgopyTestContext,
+    contract: SoulboundTicket,
+    event_id: ARC4UInt64,
+    ticket_serial: int,
+    amount: int,
+) -> None:
+    """Buy a ticket as the default sender, paying amount in the same group."""
+    payment = context.any.txn.payment(
+        sender=context.default_sender,
+        receiver=context.ledger.get_app(contract).address,
+        amount=UInt64(amount),
+    )
+    call = context.txn.defer_app_call(contract.buy_ticket, event_id, ARC4UInt64(0), ARC4UInt64(ticket_serial))
+    with context.txn.create_group([payment, call]):
+        call.submit()
+
+
 class TestSoulboundTicket:
     """Test suite for SoulboundTicket contract."""
     
     @pytest.fixture
-    def context(self) -> AlgopyTestContext:
-        """Create a fresh testing context for each test."""
-        with algopy_testing_context() as ctx:
-            yield ctx
-    
-    def test_create_contract(self, context: AlgopyTestContext):
-        """Test creating the soulbound ticket contract."""
-        # Act
+    def contract(self, context: AlgopyTestContext) -> SoulboundTicket:
+        """Create a soulbound ticket contract for the test."""
         contract = SoulboundTicket()
         contract.create()
-        
-        # Assert
-        assert contract.event_count.value == 0
+        return contract
     
-    def test_create_event(self, context: AlgopyTestContext):
+    def test_create_event(self, context: AlgopyTestContext, contract: SoulboundTicket):
         """Test creating an event with tickets."""
         # Arrange
-        from algopy.arc4 import UInt64 as ARC4UInt64, String
-        
-        contract = SoulboundTicket()
-        contract.create()
-        
         # Act
         event_id = contract.create_event(
             name=String("Tech Fest 2026"),
@@ -53,16 +60,12 @@ class TestSoulboundTicket:
         assert event_id.native == 0
         assert contract.event_count.value == 1
     
-    def test_get_event_count(self, context: AlgopyTestContext):
+    @pytest.mark.parametrize("n_events", [0, 1, 3])
+    def test_get_event_count(self, context: AlgopyTestContext, contract: SoulboundTicket, n_events: int):
         """Test getting event count."""
         # Arrange
-        from algopy.arc4 import UInt64 as ARC4UInt64, String
-        
-        contract = SoulboundTicket()
-        contract.create()
-        
         # Create multiple events
-        for i in range(3):
+        for i in range(n_events):
             contract.create_event(
                 name=String(f"Event {i}"),
                 max_tickets=ARC4UInt64(50),
@@ -75,16 +78,11 @@ class TestSoulboundTicket:
         count = contract.get_event_count()
         
         # Assert
-        assert count.native == 3
+        assert count.native == n_events
     
-    def test_verify_ticket_no_ticket(self, context: AlgopyTestContext):
+    def test_verify_ticket_no_ticket(self, context: AlgopyTestContext, contract: SoulboundTicket):
         """Test ticket verification when holder has no ticket."""
         # Arrange
-        from algopy.arc4 import UInt64 as ARC4UInt64, String, Address
-        
-        contract = SoulboundTicket()
-        contract.create()
-        
         contract.create_event(
             name=String("Concert"),
             max_tickets=ARC4UInt64(100),
@@ -96,19 +94,147 @@ class TestSoulboundTicket:
         random_holder = context.any.account()
         
         # Act
-        result = contract.verify_ticket(Address(random_holder.bytes), ARC4UInt64(0))
+        result = contract.verify_ticket(Address(random_holder.bytes), ARC4UInt64(0), ARC4UInt64(0))
         
         # Assert
         assert result.native == False
     
-    def test_cannot_delete_with_events(self, context: AlgopyTestContext):
-        """Test that contract cannot be deleted with active events."""
+    def test_verify_ticket_zero_address(self, context: AlgopyTestContext, contract: SoulboundTicket):
+        """Test that the zero address doesn't verify against a free slot."""
+        # Arrange - buying serial 0 creates the page holding free serial 1
+        event_id = contract.create_event(
+            name=String("Concert"),
+            max_tickets=ARC4UInt64(100),
+            price=ARC4UInt64(2_000_000),
+            event_date=ARC4UInt64(1739000000),
+            venue=String("Stadium")
+        )
+        buy(context, contract, event_id, 0, amount=2_000_000)
+        
+        # Act
+        result = contract.verify_ticket(Address(bytes(32)), event_id, ARC4UInt64(1))
+        
+        # Assert
+        assert result.native == False
+    
+    def test_buy_ticket_rejects_invalid_serial(self, context: AlgopyTestContext, contract: SoulboundTicket):
+        """Test that ticket serials must fall inside the event's holder slots."""
         # Arrange
-        from algopy.arc4 import UInt64 as ARC4UInt64, String
+        event_id = contract.create_event(
+            name=String("Workshop"),
+            max_tickets=ARC4UInt64(1),
+            price=ARC4UInt64(1_000_000),
+            event_date=ARC4UInt64(1739000000),
+            venue=String("Lab 3")
+        )
         
-        contract = SoulboundTicket()
-        contract.create()
+        # Act & Assert - serial 1 is past the single ticket slot
+        with pytest.raises(AssertionError, match="Invalid ticket serial"):
+            contract.buy_ticket(event_id, ARC4UInt64(0), ARC4UInt64(1))
+    
+    def test_buy_ticket_requires_payment(self, context: AlgopyTestContext, contract: SoulboundTicket):
+        """Test that a ticket can't be bought without paying its price."""
+        # Arrange
+        event_id = contract.create_event(
+            name=String("Workshop"),
+            max_tickets=ARC4UInt64(1),
+            price=ARC4UInt64(1_000_000),
+            event_date=ARC4UInt64(1739000000),
+            venue=String("Lab 3")
+        )
+        
+        # Act & Assert
+        with pytest.raises(AssertionError, match="Payment must equal the ticket price"):
+            buy(context, contract, event_id, 0, amount=1)
+    
+    def test_buy_ticket(self, context: AlgopyTestContext, contract: SoulboundTicket):
+        """Test that buying records the holder in the serial's holder page."""
+        # Arrange - serial 21 is the first record of the second page
+        event_id = contract.create_event(
+            name=String("Workshop"),
+            max_tickets=ARC4UInt64(30),
+            price=ARC4UInt64(1_000_000),
+            event_date=ARC4UInt64(1739000000),
+            venue=String("Lab 3")
+        )
+        buyer = context.default_sender
+        
+        # Act
+        buy(context, contract, event_id, 21, amount=1_000_000)
+        
+        # Assert
+        page = context.ledger.get_box(contract, b"h_" + (0).to_bytes(8, "big") + (1).to_bytes(8, "big"))
+        assert len(page) == 1008
+        assert page[:32] == buyer.bytes.value
+        assert contract.verify_ticket(Address(buyer.bytes), event_id, ARC4UInt64(21)).native
+        *_, sold, _, _ = contract.get_event(event_id).native
+        assert sold == 1
+    
+    def test_check_in(self, context: AlgopyTestContext, contract: SoulboundTicket):
+        """Test that checking in stamps the holder's record."""
+        # Arrange
+        event_id = contract.create_event(
+            name=String("Workshop"),
+            max_tickets=ARC4UInt64(5),
+            price=ARC4UInt64(1_000_000),
+            event_date=ARC4UInt64(1739000000),
+            venue=String("Lab 3")
+        )
+        buy(context, contract, event_id, 2, amount=1_000_000)
+        context.ledger.patch_global_fields(latest_timestamp=UInt64(1739000100))
+        
+        # Act
+        contract.check_in(event_id, ARC4UInt64(2))
         
+        # Assert - record 2 starts at byte 96, checked_in_at at +40
+        page = context.ledger.get_box(contract, b"h_" + (0).to_bytes(8, "big") + (0).to_bytes(8, "big"))
+        assert int.from_bytes(page[136:144], "big") == 1739000100
+    
+    def test_check_in_requires_ticket(self, context: AlgopyTestContext, contract: SoulboundTicket):
+        """Test that only the ticket's holder can check in with it."""
+        # Arrange
+        event_id = contract.create_event(
+            name=String("Workshop"),
+            max_tickets=ARC4UInt64(5),
+            price=ARC4UInt64(1_000_000),
+            event_date=ARC4UInt64(1739000000),
+            venue=String("Lab 3")
+        )
+        buy(context, contract, event_id, 0, amount=1_000_000)
+        
+        # Act & Assert
+        with context.txn.create_group(active_txn_overrides={"sender": context.any.account()}):
+            with pytest.raises(AssertionError, match="No ticket found"):
+                contract.check_in(event_id, ARC4UInt64(0))
+    
+    def test_revoke_ticket_refunds_price_paid(self, context: AlgopyTestContext, contract: SoulboundTicket):
+        """Test that revoking a bought ticket refunds the payment and frees the serial."""
+        # Arrange - creator (default sender) buys ticket 0 of their own event
+        event_id = contract.create_event(
+            name=String("Workshop"),
+            max_tickets=ARC4UInt64(1),
+            price=ARC4UInt64(1_000_000),
+            event_date=ARC4UInt64(1739000000),
+            venue=String("Lab 3")
+        )
+        buyer = context.default_sender
+        buy(context, contract, event_id, 0, amount=1_000_000)
+        assert contract.verify_ticket(Address(buyer.bytes), event_id, ARC4UInt64(0)).native
+        
+        # Act
+        contract.revoke_ticket(Address(buyer.bytes), event_id, ARC4UInt64(0))
+        
+        # Assert
+        refund = context.txn.last_group.get_itxn_group(0).payment(1)
+        assert refund.receiver == buyer
+        assert refund.amount == 1_000_000
+        assert not contract.verify_ticket(Address(buyer.bytes), event_id, ARC4UInt64(0)).native
+        *_, sold, _, _ = contract.get_event(event_id).native
+        assert sold == 0
+    
+    def test_cannot_delete_with_events(self, context: AlgopyTestContext, contract: SoulboundTicket):
+        """Test that contract cannot be deleted with active events."""
+        # Arrange
         contract.create_event(
             name=String("Event"),
             max_tickets=ARC4UInt64(50),